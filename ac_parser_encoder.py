@@ -5,9 +5,10 @@ confirmed by the game's decompiled C source code and full argument parsing.
 """
 
 from dialogue_prompt import generate_dialogue, generate_spotlight_dialogue
-from screenshot_util import capture_dolphin_screenshot
+from screenshot_util import capture_dolphin_screenshot_async
 from gossip import seed_if_needed, spread, observe_interaction, get_context_for
 import argparse
+import functools
 import memory_ipc
 import sys
 import struct
@@ -15,7 +16,8 @@ import re
 import time
 import threading
 import os
-from typing import List, Dict, Optional
+import queue
+from typing import Callable, List, Dict, Optional, Tuple, Union
 
 # --- Configuration ---
 TARGET_ADDRESS = 0x81298360
@@ -26,6 +28,13 @@ PREFIX_BYTE = 0x7F
 # Cooldown after writing generated dialogue to avoid mid-read overwrites
 SUPPRESS_SECONDS = float(os.environ.get("GENERATION_SUPPRESS_SECONDS", "25"))
 
+# Feature flags, read once (dialogue_prompt has already loaded .env on import)
+ENABLE_SCREENSHOT = os.environ.get("ENABLE_SCREENSHOT", "0") == "1"
+ENABLE_GOSSIP = os.environ.get("ENABLE_GOSSIP", "0") == "1"
+
+# How long a speaker read is reused before memory is read again
+SPEAKER_CACHE_SECONDS = 0.25
+
 # --- Data from Decompilation ---
 
 # 1. Character Maps
@@ -52,6 +61,21 @@ CHARACTER_MAP = {
 }
 REVERSE_CHARACTER_MAP = {v: k for k, v in CHARACTER_MAP.items()}
 
+
+class _EncodeTable(dict):
+    """str.translate table from codepoint to game byte; unmapped characters are
+    reported and dropped."""
+
+    def __missing__(self, codepoint: int) -> None:
+        print(f"Warning: Character '{chr(codepoint)}' not in map.")
+        return None
+
+
+# Translating a word through this table yields one codepoint per output byte,
+# so .encode("latin-1") produces the encoded bytes in a single C-level pass.
+_ENCODE_TABLE = _EncodeTable({ord(k): v for k, v in REVERSE_CHARACTER_MAP.items() if len(k) == 1})
+_NEWLINE_BYTE = REVERSE_CHARACTER_MAP["\n"]
+
 # 2. Control Codes Maps (Now more complete)
 CONTROL_CODES = {
     0x00: "<End Conversation>", 0x01: "<Continue>", 0x02: "<Clear Text>", 0x03: "<Pause [{:02X}]>", 0x04: "<Press A>",
@@ -70,7 +94,14 @@ CONTROL_CODES = {
     0x76: "<AM/PM>", 0x4C: "<Angry Voice>", # SetMessageContentsAngry_ControlCursol
     
 }
-REVERSE_CONTROL_CODES = {re.sub(r'\[.*?\]', '[{}]', v): k for k, v in CONTROL_CODES.items()}
+# Tag parsing patterns used by encode_ac_text
+_TOKEN_SPLIT_RE = re.compile(r'(<[^>]+>)')
+# Accept numbers inside brackets even if additional text is present (e.g., [Cat:01]).
+# Capture up to 6 hex digits to cover colors too.
+_TAG_ARG_RE = re.compile(r'\[[^\]]*?([0-9a-fA-F]{1,6})\]')
+_TAG_ARGS_RE = re.compile(r'\[.*?\]')
+
+REVERSE_CONTROL_CODES = {_TAG_ARGS_RE.sub('[{}]', v): k for k, v in CONTROL_CODES.items()}
 
 # Accept synonym forms without the "Cat:" label for easier authoring in decorated text
 REVERSE_CONTROL_CODES.update({
@@ -139,89 +170,177 @@ PLAYER_EMOTIONS = {
     0xFF: "Reset Emotion"
 }
 
+# 4. Argument decoders, dispatched by command byte. Each reads the command's
+# arguments in place from (data, offset) and returns the values for its
+# CONTROL_CODES template.
+_U16 = struct.Struct('>H')
+_U8_U16 = struct.Struct('>BH')
+_U8_U16_U8 = struct.Struct('>BHB')
+
+
+def _args_player_emotion(data: bytes, offset: int) -> tuple:
+    # 1 byte + 2 bytes; map the 16-bit value to an emotion name
+    emotion_code = _U16.unpack_from(data, offset + 1)[0]
+    return data[offset], PLAYER_EMOTIONS.get(emotion_code, f"Unknown_Emotion_{emotion_code:04X}")
+
+
+def _args_npc_expression(data: bytes, offset: int) -> tuple:
+    # 1 byte + 2 bytes; map the 16-bit value to an expression name
+    expr_code = _U16.unpack_from(data, offset + 1)[0]
+    return data[offset], EXPRESSION_MAP.get(expr_code, f"Unknown_{expr_code:04X}")
+
+
+def _args_music(data: bytes, offset: int) -> tuple:
+    # Play Music / Stop Music: 1 byte music id + 1 byte transition
+    music_id, transition_type = data[offset], data[offset + 1]
+    return (
+        MUSIC_LIST.get(music_id, f"Unknown_Music_{music_id:02X}"),
+        MUSIC_TRANSITIONS.get(transition_type, f"Unknown_Transition_{transition_type:02X}"),
+    )
+
+
+def _args_sound_effect(data: bytes, offset: int) -> tuple:
+    sound_id = data[offset]
+    return (SOUNDEFFECT_LIST.get(sound_id, f"Unknown_Sound_{sound_id:02X}"),)
+
+
+def _args_color_line(data: bytes, offset: int) -> tuple:
+    # 24-bit color, read as high byte + low word
+    high, low = _U8_U16.unpack_from(data, offset)
+    return ((high << 16) | low,)
+
+
+def _args_color_chars(data: bytes, offset: int) -> tuple:
+    # 24-bit color + 1-byte character count
+    high, low, count = _U8_U16_U8.unpack_from(data, offset)
+    return (high << 16) | low, count
+
+
+# Odd-sized arguments are individual bytes, even-sized ones are 16-bit words
+_ARG_PARSERS: Dict[int, Callable[[bytes, int], tuple]] = {
+    command: struct.Struct(f'>{count // 2}H' if count % 2 == 0 else f'>{count}B').unpack_from
+    for command, count in CODE_ARG_COUNT.items()
+}
+_ARG_PARSERS.update({
+    0x05: _args_color_line,
+    0x08: _args_player_emotion,
+    0x09: _args_npc_expression,
+    0x50: _args_color_chars,
+    0x56: _args_music,
+    0x57: _args_music,
+    0x59: _args_sound_effect,
+})
+
+# 256-entry tables indexed by byte value. _CHAR_TABLE doubles as the str.translate
+# table for latin-1 decoded runs, so plain characters decode in a single call.
+_CHAR_TABLE = [CHARACTER_MAP.get(i, f"[?{i:02X}]") for i in range(256)]
+_CONTROL_DESC_TABLE = [CONTROL_CODES.get(i, f"<Code 0x{i:02X}>") for i in range(256)]
+_ARG_COUNT_TABLE = [CODE_ARG_COUNT.get(i, 0) for i in range(256)]
+
+
+@functools.lru_cache(maxsize=512)
 def parse_ac_text(data: bytes) -> str:
-    """Parses raw dialogue data with full argument handling."""
+    """Parses raw dialogue data with full argument handling.
+
+    Memoized on the raw bytes: the watch loop sees the same buffer on most ticks.
+    """
     text_buffer = []
     i = 0
-    while i < len(data):
-        byte = data[i]
-        if byte == 0x00: break
+    end = len(data)
+    # Control code arguments may contain 0x00, so the terminator position is
+    # refreshed whenever a control code skips past it.
+    terminator = data.find(b"\x00")
+    while i < end:
+        if terminator != -1 and terminator < i:
+            terminator = data.find(b"\x00", i)
+        run_end = end if terminator == -1 else terminator
+        prefix = data.find(b"\x7f", i, run_end)
+        if prefix != -1:
+            run_end = prefix
+
+        # Plain characters up to the next control code or terminator
+        if run_end > i:
+            text_buffer.append(data[i:run_end].decode("latin-1").translate(_CHAR_TABLE))
+            i = run_end
+        if prefix == -1:
+            break
 
-        if byte == PREFIX_BYTE:
-            i += 1
-            if i >= len(data): break
-            
-            command = data[i]
-            if command == 0x00:
-                text_buffer.append(CONTROL_CODES[command])
-                break
+        # Control code: skip the prefix byte and read the command
+        i += 1
+        if i >= end: break
+        
+        command = data[i]
+        if command == 0x00:
+            text_buffer.append(CONTROL_CODES[command])
+            break
 
-            desc = CONTROL_CODES.get(command, f"<Code 0x{command:02X}>")
-            num_args = CODE_ARG_COUNT.get(command, 0)
-            
-            if num_args > 0:
-                args_bytes = data[i+1 : i+1+num_args]
-                args_tuple = []
-                
-                if len(args_bytes) < num_args:
-                    text_buffer.append(f"<Malformed Code 0x{command:02X}>")
-                    i += 1 + len(args_bytes)
-                    continue
+        desc = _CONTROL_DESC_TABLE[command]
+        num_args = _ARG_COUNT_TABLE[command]
+        
+        if num_args > 0:
+            available = end - i - 1
+            if available < num_args:
+                text_buffer.append(f"<Malformed Code 0x{command:02X}>")
+                i += 1 + available
+                continue
 
-                    
-                if command in [0x08, 0x09]: # 1 byte + 2 bytes
-                    if command == 0x09:
-                        # For NPC Expression, map the second argument (16-bit value) to expression name
-                        first_arg = args_bytes[0]
-                        expr_code = struct.unpack('>H', args_bytes[1:3])[0]
-                        expr_name = EXPRESSION_MAP.get(expr_code, f"Unknown_{expr_code:04X}")
-                        args_tuple.extend([first_arg, expr_name])
-                    elif command == 0x08:
-                        # For Player Emotion, map the second argument (16-bit value) to emotion name
-                        first_arg = args_bytes[0]
-                        emotion_code = struct.unpack('>H', args_bytes[1:3])[0]
-                        emotion_name = PLAYER_EMOTIONS.get(emotion_code, f"Unknown_Emotion_{emotion_code:04X}")
-                        args_tuple.extend([first_arg, emotion_name])
-                    else:
-                        args_tuple.extend([args_bytes[0], struct.unpack('>H', args_bytes[1:3])[0]])
-                elif command in [0x56, 0x57]: # 1 byte + 1 byte
-                    # For Play Music and Stop Music commands
-                    music_id = args_bytes[0]
-                    transition_type = args_bytes[1]
-                    music_name = MUSIC_LIST.get(music_id, f"Unknown_Music_{music_id:02X}")
-                    transition_name = MUSIC_TRANSITIONS.get(transition_type, f"Unknown_Transition_{transition_type:02X}")
-                    args_tuple.extend([music_name, transition_name])
-                elif num_args == 1:
-                    if command == 0x59:  # Play Sound Effect
-                        sound_id = args_bytes[0]
-                        sound_name = SOUNDEFFECT_LIST.get(sound_id, f"Unknown_Sound_{sound_id:02X}")
-                        args_tuple.append(sound_name)
-                    else:
-                        args_tuple.append(args_bytes[0])
-                elif num_args == 2: args_tuple.append(struct.unpack('>H', args_bytes)[0])
-                elif num_args == 3 and command == 0x05: args_tuple.append(int.from_bytes(args_bytes, 'big'))
-                elif num_args == 3: args_tuple.extend([args_bytes[0], args_bytes[1], args_bytes[2]])
-                elif num_args == 4 and command == 0x50: args_tuple.extend([int.from_bytes(args_bytes[0:3], 'big'), args_bytes[3]])
-                else:
-                    for j in range(0, num_args, 2): args_tuple.append(struct.unpack('>H', args_bytes[j:j+2])[0])
-                
-                try: text_buffer.append(desc.format(*args_tuple))
-                except (TypeError, IndexError): text_buffer.append(desc)
-                
-                i += num_args
-            else:
-                text_buffer.append(desc)
-            
-            i += 1
-            continue
+            args_tuple = _ARG_PARSERS[command](data, i + 1)
 
-        char = CHARACTER_MAP.get(byte, f"[?{byte:02X}]")
-        text_buffer.append(char)
-        i += 1
+            try: text_buffer.append(desc.format(*args_tuple))
+            except (TypeError, IndexError): text_buffer.append(desc)
+            
+            i += num_args
+        else:
+            text_buffer.append(desc)
         
+        i += 1
+
     return "".join(text_buffer)
 
 
+# Control tags that LLMs commonly emit without square brackets, as
+# (pattern, normalized template, zero-fill width per hex argument).
+# Order matters: earlier forms win when several could match the same tag.
+_CONTROL_TAG_FIXES = [
+    # Normalize NPC/Player emotion tags that may be missing brackets
+    (r"<NPC\s+Expression\s+\[?(?:Cat:)?([0-9A-Fa-f]{1,2})\]?\s+\[?([0-9A-Fa-f]{1,4})\]?>", "<NPC Expression [{}] [{}]>", (2, 4)),
+    (r"<Player\s+Emotion\s+\[?([0-9A-Fa-f]{1,2})\]?\s+\[?([0-9A-Fa-f]{1,4})\]?>", "<Player Emotion [{}] [{}]>", (2, 4)),
+    # Two-hex-arg codes
+    (r"<Pause\s+([0-9A-Fa-f]{1,2})>", "<Pause [{}]>", (2,)),
+    (r"<Line Type\s+([0-9A-Fa-f]{1,2})>", "<Line Type [{}]>", (2,)),
+    (r"<Play Sound Effect\s+([0-9A-Fa-f]{1,2})>", "<Play Sound Effect [{}]>", (2,)),
+    # Four-hex-arg codes
+    (r"<Char Size\s+([0-9A-Fa-f]{1,4})>", "<Char Size [{}]>", (4,)),
+    (r"<Line Size\s+([0-9A-Fa-f]{1,4})>", "<Line Size [{}]>", (4,)),
+    # Inline segment color missing trailing 'chars': <Color HEX for NN>
+    (r"<Color\s+\[?([0-9A-Fa-f]{6})\]?\s+for\s+\[?([0-9A-Fa-f]{1,2})\]?>", "<Color [{}] for [{}] chars>", (6, 2)),
+    # Inline segment color (ensure brackets around both args and include 'chars')
+    (r"<Color\s+\[?([0-9A-Fa-f]{6})\]?\s+for\s+\[?([0-9A-Fa-f]{1,2})\]?\s+chars?>", "<Color [{}] for [{}] chars>", (6, 2)),
+    # Line color with missing brackets
+    (r"<Color\s+Line\s+\[?([0-9A-Fa-f]{6})\]?>", "<Color Line [{}]>", (6,)),
+    # Bare <Color HEX> → assume line color
+    (r"<Color\s+([0-9A-Fa-f]{6})>", "<Color Line [{}]>", (6,)),
+    # Bracketed but missing 'Line': <Color [HEX]> → <Color Line [HEX]>
+    (r"<Color\s+\[([0-9A-Fa-f]{6})\]>", "<Color Line [{}]>", (6,)),
+]
+
+# Every form fused into one alternation so the text is scanned once
+_CONTROL_TAG_RE = re.compile("|".join(f"(?P<fix{n}>{pattern})" for n, (pattern, _, _) in enumerate(_CONTROL_TAG_FIXES)))
+_CONTROL_TAG_DISPATCH = {
+    f"fix{n}": (_CONTROL_TAG_RE.groupindex[f"fix{n}"], template, widths)
+    for n, (_, template, widths) in enumerate(_CONTROL_TAG_FIXES)
+}
+_CLOSING_TAG_RE = re.compile(r"</[^>]+>")
+
+
+def _fix_control_tag(m: re.Match) -> str:
+    group, template, widths = _CONTROL_TAG_DISPATCH[m.lastgroup]
+    args = m.group(*range(group + 1, group + 1 + len(widths)))
+    if len(widths) == 1:
+        args = (args,)
+    return template.format(*(arg.upper().zfill(width) for arg, width in zip(args, widths)))
+
+
 def _normalize_control_tags(text: str) -> str:
     """Normalize common control tags missing square brackets around numeric args.
 
@@ -233,69 +352,21 @@ def _normalize_control_tags(text: str) -> str:
     - <Char Size 0040> -> <Char Size [0040]>
     - <Line Size 001E> -> <Line Size [001E]>
     """
-    def two_hex(m):
-        return f"{m.group(1)} [{m.group(2).upper().zfill(2)}]>"
-
-    def four_hex(m):
-        return f"{m.group(1)} [{m.group(2).upper().zfill(4)}]>"
-
     # Strip any HTML-style closing tags produced by LLMs (unsupported in engine)
-    text = re.sub(r"</[^>]+>", "", text)
-
-    # Normalize NPC/Player emotion tags that may be missing brackets
-    text = re.sub(
-        r"<NPC\s+Expression\s+\[?(?:Cat:)?([0-9A-Fa-f]{1,2})\]?\s+\[?([0-9A-Fa-f]{1,4})\]?>",
-        lambda m: f"<NPC Expression [{m.group(1).upper().zfill(2)}] [{m.group(2).upper().zfill(4)}]>",
-        text,
-    )
-    text = re.sub(
-        r"<Player\s+Emotion\s+\[?([0-9A-Fa-f]{1,2})\]?\s+\[?([0-9A-Fa-f]{1,4})\]?>",
-        lambda m: f"<Player Emotion [{m.group(1).upper().zfill(2)}] [{m.group(2).upper().zfill(4)}]>",
-        text,
-    )
-
-    # Two-hex-arg codes
-    text = re.sub(r"<(Pause)\s+([0-9A-Fa-f]{1,2})>", lambda m: f"<Pause [{m.group(2).upper().zfill(2)}]>", text)
-    text = re.sub(r"<(Line Type)\s+([0-9A-Fa-f]{1,2})>", lambda m: f"<Line Type [{m.group(2).upper().zfill(2)}]>", text)
-    text = re.sub(r"<(Play Sound Effect)\s+([0-9A-Fa-f]{1,2})>", lambda m: f"<Play Sound Effect [{m.group(2).upper().zfill(2)}]>", text)
-
-    # Four-hex-arg codes
-    text = re.sub(r"<(Char Size)\s+([0-9A-Fa-f]{1,4})>", lambda m: f"<Char Size [{m.group(2).upper().zfill(4)}]>", text)
-    text = re.sub(r"<(Line Size)\s+([0-9A-Fa-f]{1,4})>", lambda m: f"<Line Size [{m.group(2).upper().zfill(4)}]>", text)
-
-    # Color tags
-    # Inline segment color missing trailing 'chars': <Color HEX for NN>
-    text = re.sub(
-        r"<Color\s+\[?([0-9A-Fa-f]{6})\]?\s+for\s+\[?([0-9A-Fa-f]{1,2})\]?>",
-        lambda m: f"<Color [{m.group(1).upper()}] for [{m.group(2).upper().zfill(2)}] chars>",
-        text,
-    )
-    # Inline segment color (ensure brackets around both args and include 'chars')
-    text = re.sub(
-        r"<Color\s+\[?([0-9A-Fa-f]{6})\]?\s+for\s+\[?([0-9A-Fa-f]{1,2})\]?\s+chars?>",
-        lambda m: f"<Color [{m.group(1).upper()}] for [{m.group(2).upper().zfill(2)}] chars>",
-        text,
-    )
-    # Line color with missing brackets
-    text = re.sub(
-        r"<Color\s+Line\s+\[?([0-9A-Fa-f]{6})\]?>",
-        lambda m: f"<Color Line [{m.group(1).upper()}]>",
-        text,
-    )
-    # Bare <Color HEX> → assume line color
-    text = re.sub(
-        r"<Color\s+([0-9A-Fa-f]{6})>",
-        lambda m: f"<Color Line [{m.group(1).upper()}]>",
-        text,
-    )
-    # Bracketed but missing 'Line': <Color [HEX]> → <Color Line [HEX]>
-    text = re.sub(
-        r"<Color\s+\[([0-9A-Fa-f]{6})\]>",
-        lambda m: f"<Color Line [{m.group(1).upper()}]>",
-        text,
-    )
-
-    return text
+    text = _CLOSING_TAG_RE.sub("", text)
+    return _CONTROL_TAG_RE.sub(_fix_control_tag, text)
+
+
+_VISIBLE_TEXT_TRANSLATE = str.maketrans({
+    "\u2019": "'",  # right single quotation mark
+    "\u2018": "'",  # left single quotation mark
+    "\u201C": '"',  # left double quotation mark
+    "\u201D": '"',  # right double quotation mark
+    "\u2014": "-",  # em dash
+    "\u2013": "-",  # en dash
+    "\u2026": "...",  # ellipsis
+    "\u00A0": " ",  # non-breaking space
+})
 
 
 def _normalize_visible_text(text: str) -> str:
@@ -308,19 +379,7 @@ def _normalize_visible_text(text: str) -> str:
     - … → ...
     - non-breaking space → regular space
     """
-    replacements = {
-        "\u2019": "'",  # right single quotation mark
-        "\u2018": "'",  # left single quotation mark
-        "\u201C": '"',  # left double quotation mark
-        "\u201D": '"',  # right double quotation mark
-        "\u2014": "-",  # em dash
-        "\u2013": "-",  # en dash
-        "\u2026": "...",  # ellipsis
-        "\u00A0": " ",  # non-breaking space
-    }
-    for src, dst in replacements.items():
-        text = text.replace(src, dst)
-    return text
+    return text.translate(_VISIBLE_TEXT_TRANSLATE)
 
 
 START_MENU_TIME_REGEXES = [
@@ -341,97 +400,142 @@ START_MENU_TIME_REGEXES = [
 ]
 
 
+# Tags present in every START_MENU_TIME_REGEXES variant, rarest first
+_START_MENU_REQUIRED_TAGS = ("<Town Name>", "<String 4>", "<AM/PM>", "<Hour>:<Minute>")
+
+
 def is_start_menu_time_announcement(text: str) -> bool:
     """Detects the START MENU time announcement by matching known decoded variants.
 
     Handles both time-first and date-first forms, optional <Clear Text>/<Set Jump>,
     and flexible whitespace/newlines.
     """
-    return False
-    # Fast-path: observed build uses this specific jump target at end of announcement
-    if "Right now" and "<String 4>" and "<Town Name>" and "<Hour>:<Minute>" and "<AM/PM>" and "<Month>" and "<Day>" and "<Year>" and "<Set Jump" in text:
-        return True
+    # Cheap prefilter: every variant contains these control tags, which the
+    # parser always emits with this exact spelling.
+    for tag in _START_MENU_REQUIRED_TAGS:
+        if tag not in text:
+            return False
     for rx in START_MENU_TIME_REGEXES:
         if rx.search(text):
             return True
     return False
 
+# Raw tag token -> (base_tag, hex args). Distinct tags are few, so this saturates
+# quickly; it is cleared if it ever grows past _TAG_CACHE_MAX entries.
+_TAG_CACHE: Dict[str, Tuple[str, Tuple[int, ...]]] = {}
+_TAG_CACHE_MAX = 4096
+
+
+def _split_tag(token: str) -> Tuple[str, Tuple[int, ...]]:
+    """Splits a tag like <Pause [0A]> into its template (<Pause [{}]>) and args."""
+    cached = _TAG_CACHE.get(token)
+    if cached is None:
+        args = tuple(int(arg, 16) for arg in _TAG_ARG_RE.findall(token))
+        cached = (_TAG_ARGS_RE.sub('[{}]', token), args)
+        if len(_TAG_CACHE) >= _TAG_CACHE_MAX:
+            _TAG_CACHE.clear()
+        _TAG_CACHE[token] = cached
+    return cached
+
+
+def _encode_control_code(command_byte: int, args: Tuple[int, ...]) -> bytes:
+    """Packs a control code and its arguments into prefix + command + arg bytes."""
+    head = bytes((PREFIX_BYTE, command_byte))
+    num_args_expected = CODE_ARG_COUNT.get(command_byte, 0)
+    if num_args_expected == 0:
+        return head
+    if num_args_expected == 1: return head + struct.pack('>B', args[0])
+    if num_args_expected == 2: return head + struct.pack('>H', args[0])
+    if num_args_expected == 3 and command_byte == 0x05: return head + args[0].to_bytes(3, 'big')
+    if num_args_expected == 3 and command_byte in (0x08, 0x09):
+        # 0x08 Player Emotion and 0x09 NPC Expression use 1 byte + 2 byte packing
+        return head + struct.pack('>BH', args[0], args[1])
+    if num_args_expected == 4 and command_byte == 0x50:
+        return head + args[0].to_bytes(3, 'big') + struct.pack('>B', args[1])
+    return head + struct.pack(f'>{len(args)}H', *args)
+
+
+@functools.lru_cache(maxsize=256)
 def encode_ac_text(text: str) -> bytes:
-    """Encodes a human-readable string into Animal Crossing's byte format."""
-    encoded = bytearray()
+    """Encodes a human-readable string into Animal Crossing's byte format.
+
+    Memoized on the input string; unknown-tag/character warnings are only
+    printed the first time a given string is encoded.
+    """
+    parts: List[bytes] = []  # Encoded fragments, joined once at the end
     # Normalize control tags like <Pause 0A> to <Pause [0A]>
     text = _normalize_visible_text(_normalize_control_tags(text))
-    tokens = re.split(r'(<[^>]+>)', text)
+    tokens = _TOKEN_SPLIT_RE.split(text)
     char_count = 0  # Track characters on current line
-    
+
     for token in tokens:
         if not token: continue
-        
+
         if token.startswith('<') and token.endswith('>'):
-            # Accept numbers inside brackets even if additional text is present (e.g., [Cat:01])
-            # Capture up to 6 hex digits to cover colors too
-            arg_pattern = re.compile(r'\[[^\]]*?([0-9a-fA-F]{1,6})\]')
-            args = [int(arg, 16) for arg in arg_pattern.findall(token)]
-            base_tag = re.sub(r'\[.*?\]', '[{}]', token)
+            base_tag, args = _split_tag(token)
             command_byte = REVERSE_CONTROL_CODES.get(base_tag)
-            
+
             if command_byte is not None:
-                encoded.append(PREFIX_BYTE)
-                encoded.append(command_byte)
-                
-                num_args_expected = CODE_ARG_COUNT.get(command_byte, 0)
-                if num_args_expected > 0:
-                    arg_bytes = bytearray()
-                    if num_args_expected == 1: arg_bytes.extend(struct.pack('>B', args[0]))
-                    elif num_args_expected == 2: arg_bytes.extend(struct.pack('>H', args[0]))
-                    elif num_args_expected == 3 and command_byte == 0x05: arg_bytes.extend(args[0].to_bytes(3, 'big'))
-                    elif num_args_expected == 3 and command_byte in (0x08, 0x09):
-                        # 0x08 Player Emotion and 0x09 NPC Expression use 1 byte + 2 byte packing
-                        arg_bytes.extend(struct.pack('>B', args[0]))
-                        arg_bytes.extend(struct.pack('>H', args[1]))
-                    elif num_args_expected == 4 and command_byte == 0x50:
-                        arg_bytes.extend(args[0].to_bytes(3, 'big'))
-                        arg_bytes.extend(struct.pack('>B', args[1]))
-                    else:
-                        for arg in args: arg_bytes.extend(struct.pack('>H', arg))
-                    encoded.extend(arg_bytes)
+                parts.append(_encode_control_code(command_byte, args))
             else:
                 print(f"Warning: Unknown tag '{token}'")
         else:
-            # Process text token with smart word wrapping
-            words = token.split(' ')
-            for word_idx, word in enumerate(words):
-                # Check if adding this word would exceed the line limit
-                word_length = len(word)
-                space_needed = 1 if word_idx > 0 and char_count > 0 else 0  # Account for space before word
-                
-                if char_count > 0 and char_count + space_needed + word_length > 30:
-                    # Need to wrap - add newline and reset counter
-                    encoded.append(0xCD)  # Newline byte
-                    char_count = 0
-                    space_needed = 0  # No space needed after newline
-                
-                # Add space before word if needed
-                if space_needed > 0:
-                    encoded.append(0x20)  # Space byte
-                    char_count += 1
-                
+            # Process text token with smart word wrapping. The token is encoded in
+            # one pass; wrap decisions use the source word lengths.
+            token_bytes = token.translate(_ENCODE_TABLE).encode("latin-1")
+            word_lengths = map(len, token.split(' '))
+            for word_idx, (word_length, word_bytes) in enumerate(zip(word_lengths, token_bytes.split(b' '))):
+                if char_count > 0:
+                    space_needed = 1 if word_idx > 0 else 0  # Account for space before word
+                    if char_count + space_needed + word_length > 30:
+                        # Need to wrap - add newline and reset counter
+                        parts.append(b"\xCD")  # Newline byte
+                        char_count = 0
+                    elif space_needed:
+                        parts.append(b" ")  # Space byte
+                        char_count += 1
+
                 # Add the word
-                for char in word:
-                    byte_val = REVERSE_CHARACTER_MAP.get(char)
-                    if byte_val is not None:
-                        encoded.append(byte_val)
-                        if char == '\n':
-                            char_count = 0
-                        else:
-                            char_count += 1
-                    else:
-                        print(f"Warning: Character '{char}' not in map.")
+                parts.append(word_bytes)
+                last_newline = word_bytes.rfind(_NEWLINE_BYTE)
+                if last_newline == -1:
+                    char_count += len(word_bytes)
+                else:
+                    char_count = len(word_bytes) - last_newline - 1
+
+    parts.append(b"\x00")  # Add the null terminator
+    return b"".join(parts)
+
+def _encode_and_predict(text: str) -> Tuple[bytes, str]:
+    """Returns (encoded bytes, text the game buffer will parse back to) for text."""
+    encoded = encode_ac_text(text)
+    return encoded, parse_ac_text(encoded)
+
+
+_SPEAKER_END_RE = re.compile(rb"[\x00-\x1F\x7F]")
+_TRAILING_CONTROL_RE = re.compile(r"[\x00-\x1F\x7F]+$")
+
+
+# Last speaker read and its time.monotonic() timestamp
+_speaker_cache: Dict[str, object] = {"value": None, "ts": None}
+
+
+def get_current_speaker(force: bool = False) -> Optional[str]:
+    """Returns the current speaker, reusing a read from the last SPEAKER_CACHE_SECONDS.
+
+    Pass force=True to always read memory.
+    """
+    now = time.monotonic()
+    cached_ts = _speaker_cache["ts"]
+    if not force and cached_ts is not None and now - cached_ts < SPEAKER_CACHE_SECONDS:
+        return _speaker_cache["value"]
+    speaker = _read_current_speaker()
+    _speaker_cache["value"] = speaker
+    _speaker_cache["ts"] = now
+    return speaker
 
-    encoded.append(0x00) # Add the null terminator
-    return bytes(encoded)
 
-def get_current_speaker() -> Optional[str]:
+def _read_current_speaker() -> Optional[str]:
     """Reads current speaker name with variable length handling.
 
     Behavior:
@@ -441,23 +545,19 @@ def get_current_speaker() -> Optional[str]:
     - Return None if empty or all-zero buffer
     """
     raw_bytes = memory_ipc.read_memory(0x8129A3EA, 32)
-    if not raw_bytes or all(b == 0 for b in raw_bytes):
+    if not raw_bytes or not raw_bytes.strip(b"\x00"):
         return None
 
-    # Consider only up to first NUL
-    candidate = raw_bytes.split(b"\x00", 1)[0]
-    # Truncate at the first control byte (exclude spaces which we'll rstrip later)
-    for idx, byte in enumerate(candidate):
-        if byte < 0x20 or byte == 0x7F:
-            candidate = candidate[:idx]
-            break
+    # Consider only up to the first NUL or other control byte (exclude spaces which we'll rstrip later)
+    name_end = _SPEAKER_END_RE.search(raw_bytes)
+    candidate = raw_bytes[:name_end.start()] if name_end else raw_bytes
     try:
         speaker = candidate.decode("utf-8", errors="ignore")
     except Exception:
         return None
 
     # Strip trailing spaces and control characters again for safety
-    speaker = re.sub(r"[\x00-\x1F\x7F]+$", "", speaker).rstrip()
+    speaker = _TRAILING_CONTROL_RE.sub("", speaker).rstrip()
 
     return speaker or None
 
@@ -466,6 +566,11 @@ def write_dialogue_to_address(dialogue: str, target_address: int) -> bool:
 
     Returns True on success, False otherwise.
     """
+    return _write_encoded_to_address(encode_ac_text(dialogue), target_address)
+
+
+def _write_encoded_to_address(encoded_bytes: bytes, target_address: int) -> bool:
+    """Write already-encoded dialogue bytes to the given GameCube memory address."""
     # Ensure we are connected (retry once if needed)
     wrote = memory_ipc.write_memory(target_address, b"")
     if wrote is False:
@@ -473,26 +578,137 @@ def write_dialogue_to_address(dialogue: str, target_address: int) -> bool:
             print("❌ Connection failed. Is the game running?")
             return False
     
-    encoded_bytes = encode_ac_text(dialogue)
     return memory_ipc.write_memory(target_address, encoded_bytes)
 
 
+@functools.lru_cache(maxsize=8)
+def _end_marker_regex(end_markers: Tuple[bytes, ...]) -> "re.Pattern[bytes]":
+    """Compiles the end markers into one alternation so a chunk is scanned once."""
+    if not end_markers:
+        return re.compile(b"(?!)")  # never matches: read up to max_size
+    return re.compile(b"|".join(re.escape(marker) for marker in end_markers))
+
+
 def _read_dialogue_once(target_address: int, end_markers: List[bytes], max_size: int, chunk_size: int) -> bytes:
     """Read memory starting at address until one of the end markers is found or max_size is reached.
 
     Designed for one-shot reads. In watch mode, prefer fixed-size reads for lower overhead.
     """
+    end_marker_re = _end_marker_regex(tuple(end_markers))
+    # Markers may straddle a chunk boundary, so each search starts this far back
+    overlap = max(map(len, end_markers), default=1) - 1
     full_data = bytearray()
     for i in range(0, max_size, chunk_size):
         chunk = memory_ipc.read_memory(target_address + i, chunk_size)
         if not chunk:
             break
+        search_from = max(0, len(full_data) - overlap)
         full_data.extend(chunk)
-        if any(marker in chunk for marker in end_markers):
+        if end_marker_re.search(full_data, search_from):
             break
     return bytes(full_data)
 
 
+# Properly formatted loading placeholder that ends with Press A -> Clear Text
+LOADING_TEXT = ".<Pause [0A]>.<Pause [0A]>.<Pause [0A]><Press A><Clear Text>"
+
+
+def _generate_for_address(addr: int, initial_text: str, speaker: Optional[str], villager_list: List[str]) -> Optional[str]:
+    """Show the loading placeholder, generate dialogue and write it to addr.
+
+    Runs synchronously under GLOBAL_GENERATION_LOCK to serialize all generations.
+    Returns the text the written buffer will parse back to, or None on any error
+    so future changes can retry.
+    """
+    with GLOBAL_GENERATION_LOCK:
+        # Show loading placeholder immediately
+        write_dialogue_to_address(LOADING_TEXT, addr)
+
+        try:
+            # Capture screenshot (optional, controlled by env ENABLE_SCREENSHOT=1);
+            # it runs in the background while the gossip context is built
+            shot_future = None
+            if ENABLE_SCREENSHOT:
+                shot_future = capture_dolphin_screenshot_async()
+
+            # Build gossip context and observe this interaction
+            gossip_ctx = None
+            if ENABLE_GOSSIP and speaker:
+                try:
+                    observe_interaction(speaker, villager_names=villager_list)
+                    gossip_ctx = get_context_for(speaker, villager_names=villager_list)
+                except Exception:
+                    gossip_ctx = None
+
+            image_paths = None
+            shot = shot_future.result() if shot_future else None
+            if shot:
+                image_paths = [shot]
+
+            # Choose prompt style based on whether we're in the START MENU announcement
+            if is_start_menu_time_announcement(initial_text) and speaker:
+                llm_text = generate_spotlight_dialogue(speaker, image_paths=image_paths, gossip_context=gossip_ctx)
+            elif speaker:
+                llm_text = generate_dialogue(speaker, image_paths=image_paths, gossip_context=gossip_ctx)
+            else:
+                # Fallback if speaker couldn't be read
+                llm_text = generate_dialogue("Ace", image_paths=image_paths, gossip_context=gossip_ctx)
+
+            # Predict parsed text to avoid re-triggering immediately
+            encoded, predicted = _encode_and_predict(llm_text)
+            # Write full sequence: loading first, then LLM lines so pressing A shows the dialogue
+            _write_encoded_to_address(encoded, addr)
+            return predicted
+        except Exception:
+            return None
+
+
+def _put_latest(reads: "queue.Queue", item: object) -> None:
+    """Queue item, dropping the oldest entry if the queue is full."""
+    while True:
+        try:
+            reads.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                reads.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _poll_dialogue(
+    addresses: List[int],
+    per_read_size: int,
+    interval_s: float,
+    reads: "queue.Queue[Union[List[Tuple[int, Optional[bytes]]], BaseException]]",
+    stop: threading.Event,
+) -> None:
+    """Producer for watch_dialogue: read every address each interval and queue the batch.
+
+    When the consumer falls behind (e.g. during generation) the oldest batch is
+    dropped so it always sees recent memory. Reads are scheduled on a monotonic
+    deadline so the period stays interval_s however long a read takes.
+
+    If a read raises (including the SystemExit the macOS reader raises once
+    Dolphin is gone), the exception is queued for the consumer and polling stops.
+    """
+    # Nearby addresses are coalesced by read_many into a single read per tick
+    blocks = [(addr, per_read_size) for addr in addresses]
+    next_tick = time.monotonic()
+    try:
+        while not stop.is_set():
+            _put_latest(reads, list(zip(addresses, memory_ipc.read_many(blocks))))
+            next_tick += interval_s
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                # Fell a period or more behind; resync instead of bursting to catch up
+                next_tick = time.monotonic()
+    except BaseException as e:
+        _put_latest(reads, e)
+
+
 def watch_dialogue(
     addresses: List[int],
     per_read_size: int,
@@ -510,38 +726,74 @@ def watch_dialogue(
         sys.exit(1)
 
     last_text_by_addr: Dict[int, Optional[str]] = {addr: None for addr in addresses}
+    # Raw bytes that last_text_by_addr was decoded from; None when it holds a prediction
+    last_raw_by_addr: Dict[int, Optional[bytes]] = {addr: None for addr in addresses}
     generation_in_progress: Dict[int, bool] = {addr: False for addr in addresses}
     suppress_until_by_addr: Dict[int, float] = {addr: 0.0 for addr in addresses}
     seen_characters = set()
-
+    # Sorted view of seen_characters, rebuilt only when a new speaker shows up
+    villager_list: List[str] = []
+    current_speaker: Optional[str] = None
+
+    # Memory is polled on a background thread so decoding/generation here
+    # doesn't delay reads (and vice versa).
+    reads: "queue.Queue[Union[List[Tuple[int, Optional[bytes]]], BaseException]]" = queue.Queue(maxsize=2)
+    stop_polling = threading.Event()
+    poller = threading.Thread(
+        target=_poll_dialogue,
+        args=(addresses, per_read_size, interval_s, reads, stop_polling),
+        daemon=True,
+    )
+    poller.start()
 
     try:
         while True:
             try:
-                current_speaker = get_current_speaker()
-
-            except Exception:
-                current_speaker = None
+                # Timeout keeps Ctrl+C responsive on platforms where blocking gets aren't interruptible
+                batch = reads.get(timeout=0.5)
+            except queue.Empty:
+                if not poller.is_alive() and reads.empty():
+                    print("❌ Memory polling stopped unexpectedly")
+                    sys.exit(1)
+                continue
+
+            if isinstance(batch, BaseException):
+                # A SystemExit from the reader ends the program as it did before
+                # polling moved to a thread; anything else is reported first
+                if not isinstance(batch, SystemExit):
+                    print(f"❌ Memory polling failed: {batch!r}")
+                    sys.exit(1)
+                raise batch
+
+            # The speaker only matters when some dialogue buffer changed; quiet
+            # ticks keep the last value instead of paying for another read
+            if print_all or any(raw and raw != last_raw_by_addr[addr] for addr, raw in batch):
+                try:
+                    current_speaker = get_current_speaker()
+                except Exception:
+                    current_speaker = None
 
-            if current_speaker is not None:
-                seen_characters.add(current_speaker)
+                if current_speaker is not None and current_speaker not in seen_characters:
+                    seen_characters.add(current_speaker)
+                    villager_list = sorted(seen_characters)
 
             # Proceed regardless of whether we've successfully read a speaker yet
 
             # Seed and spread gossip gradually once we know some villagers
-            if seen_characters and os.environ.get("ENABLE_GOSSIP", "0") == "1":
+            if seen_characters and ENABLE_GOSSIP:
                 try:
-                    villager_list = sorted(seen_characters)
                     seed_if_needed(villager_list)
                     spread(villager_list)
                 except Exception:
                     pass
 
-            for addr in addresses:
-                raw = memory_ipc.read_memory(addr, per_read_size)
+            for addr, raw in batch:
                 if not raw:
                     print("No data read")
                     continue
+                # Unchanged bytes decode to the text we already handled; skip the parse
+                if not print_all and raw == last_raw_by_addr[addr]:
+                    continue
                 text = parse_ac_text(raw)
                 if print_all or text != last_text_by_addr[addr]:
                     # If we're within the suppression window and the conversation hasn't ended, skip generation
@@ -552,89 +804,50 @@ def watch_dialogue(
                         else:
                             # Track latest text to avoid re-print storms, then continue without generating
                             last_text_by_addr[addr] = text
+                            last_raw_by_addr[addr] = raw
                             continue
                     did_generate = False
                     # Only trigger the loading + generation flow if this address isn't already generating
                     # and no other generation is currently running globally.
                     if not generation_in_progress.get(addr, False) and not GLOBAL_GENERATION_LOCK.locked():
                         generation_in_progress[addr] = True
-                        # Prepare context for LLM generation only once we know we can run
-                        initial_text = text
-                        current_speaker_for_gen: Optional[str] = None
-                        if include_speaker:
-                            try:
-                                current_speaker_for_gen = get_current_speaker()
-                            except Exception:
-                                current_speaker_for_gen = None
-                                continue
-
-                        # Properly formatted loading placeholder that ends with Press A -> Clear Text
-                        loading_text = ".<Pause [0A]>.<Pause [0A]>.<Pause [0A]><Press A><Clear Text>"
-
-                        # Run generation synchronously under a global lock to serialize all generations
-                        with GLOBAL_GENERATION_LOCK:
-                            # Show loading placeholder immediately
-                            write_dialogue_to_address(loading_text, addr)
-
-                            try:
-                                # Capture screenshot (optional, controlled by env ENABLE_SCREENSHOT=1)
-                                image_paths = None
-                                if os.environ.get("ENABLE_SCREENSHOT", "0") == "1":
-                                    shot = capture_dolphin_screenshot()
-                                    if shot:
-                                        image_paths = [shot]
-
-                                # Build gossip context and observe this interaction
-                                gossip_ctx = None
-                                if os.environ.get("ENABLE_GOSSIP", "0") == "1" and current_speaker_for_gen:
-                                    try:
-                                        observe_interaction(current_speaker_for_gen, villager_names=sorted(seen_characters))
-                                        gossip_ctx = get_context_for(current_speaker_for_gen, villager_names=sorted(seen_characters))
-                                    except Exception:
-                                        gossip_ctx = None
-
-                                # Choose prompt style based on whether we're in the START MENU announcement
-                                if is_start_menu_time_announcement(initial_text) and current_speaker_for_gen:
-                                    llm_text = generate_spotlight_dialogue(current_speaker_for_gen, image_paths=image_paths, gossip_context=gossip_ctx)
-                                elif current_speaker_for_gen:
-                                    llm_text = generate_dialogue(current_speaker_for_gen, image_paths=image_paths, gossip_context=gossip_ctx)
-                                else:
-                                    # Fallback if speaker couldn't be read
-                                    llm_text = generate_dialogue("Ace", image_paths=image_paths, gossip_context=gossip_ctx)
-
-                                combined = llm_text
-                                encoded_combined = encode_ac_text(combined)
-                                # Write full sequence: loading first, then LLM lines so pressing A shows the dialogue
-                                write_dialogue_to_address(combined, addr)
-                                # Predict parsed text to avoid re-triggering immediately
-                                predicted = parse_ac_text(encoded_combined)
-                                last_text_by_addr[addr] = predicted
-                                # Start suppression timer to prevent mid-read re-generation
-                                suppress_until_by_addr[addr] = time.time() + SUPPRESS_SECONDS
-                                did_generate = True
-                            except Exception:
-                                # On any error, just mark as not generating so future changes can retry
-                                pass
-                            finally:
-                                generation_in_progress[addr] = False
-                        
+                        try:
+                            # Reuse this tick's speaker read
+                            predicted = _generate_for_address(addr, text, current_speaker if include_speaker else None, villager_list)
+                        finally:
+                            generation_in_progress[addr] = False
+                        if predicted is not None:
+                            last_text_by_addr[addr] = predicted
+                            last_raw_by_addr[addr] = None
+                            # Start suppression timer to prevent mid-read re-generation
+                            suppress_until_by_addr[addr] = time.time() + SUPPRESS_SECONDS
+                            did_generate = True
+                            # Reads queued while generating predate the write; don't act on them
+                            while True:
+                                try:
+                                    reads.get_nowait()
+                                except queue.Empty:
+                                    break
+
                     print(f"Did generate: {did_generate}")
                     header = f"Address 0x{addr:08X}"
                     if include_speaker:
-                        try:
-                            speaker = get_current_speaker()
-                            header += f" | Speaker: {speaker}"
-                        except Exception:
-                            pass
+                        header += f" | Speaker: {current_speaker}"
                     print(f"\n--- {header} ---")
                     print(text)
                     # Only update last_text_by_addr when we didn't just generate,
                     # so we don't immediately retrigger on the next tick.
                     if not did_generate:
                         last_text_by_addr[addr] = text
-            time.sleep(max(0.0, interval_s))
+                        last_raw_by_addr[addr] = raw
+                else:
+                    # Same text from new bytes (e.g. the buffer we just wrote);
+                    # remember them so following ticks skip the parse too
+                    last_raw_by_addr[addr] = raw
     except KeyboardInterrupt:
         return
+    finally:
+        stop_polling.set()
 
 
 def main():
@@ -680,15 +893,13 @@ def main():
     if args.write:
         current_speaker = get_current_speaker()
         fallback_speaker = current_speaker or "Ace"
-        image_paths = None
-        if os.environ.get("ENABLE_SCREENSHOT", "0") == "1":
-            shot = capture_dolphin_screenshot()
-            if shot:
-                image_paths = [shot]
+        shot_future = None
+        if ENABLE_SCREENSHOT:
+            shot_future = capture_dolphin_screenshot_async()
 
         # Build gossip context for one-shot generation
         gossip_ctx = None
-        if os.environ.get("ENABLE_GOSSIP", "0") == "1":
+        if ENABLE_GOSSIP:
             try:
                 if current_speaker:
                     observe_interaction(current_speaker)
@@ -696,6 +907,11 @@ def main():
             except Exception:
                 gossip_ctx = None
 
+        image_paths = None
+        shot = shot_future.result() if shot_future else None
+        if shot:
+            image_paths = [shot]
+
         if is_start_menu_time_announcement(parsed_text) and current_speaker:
             dialogue = generate_spotlight_dialogue(current_speaker, image_paths=image_paths, gossip_context=gossip_ctx)
         else:
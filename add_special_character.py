@@ -2,16 +2,97 @@
 import argparse
 import json
 import os
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 
-from character_scraper import FandomVillagerScraper
+from character_scraper import FandomVillagerScraper, dump_json, load_json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def upsert_character(name: str, url: str, output_path: str) -> None:
-    scraper = FandomVillagerScraper(delay_seconds=0.5, cache_dir=None)
-    details = scraper.parse_villager_page(url)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def pending_path_for(output_path: str) -> str:
+    """Sidecar JSON-lines file holding upserts not yet merged into output_path."""
+    root, _ext = os.path.splitext(output_path)
+    return root + ".jsonl"
+
+
+def append_character_jsonl(name: str, record: Dict, jsonl_path: str) -> None:
+    """Append one {name: record} line; cost is independent of how many villagers exist."""
+    if orjson is not None:
+        line = orjson.dumps({name: record})
+    else:
+        line = json.dumps({name: record}, ensure_ascii=False).encode("utf-8")
+    with open(jsonl_path, "ab") as f:
+        f.write(line + b"\n")
+
+
+def _merge_streaming(pending: Dict[str, Dict], output_path: str) -> None:
+    """Rewrite output_path one villager at a time, swapping in pending records.
+
+    ijson parses a single existing record at a time, so memory stays near one
+    record instead of the whole file. The layout matches dump_json's.
+    """
+    remaining = dict(pending)
+    tmp_path = output_path + ".tmp"
+
+    def write_item(dst, name: str, record: Dict, first: bool) -> None:
+        body = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        dst.write(("\n  " if first else ",\n  ") + json.dumps(name, ensure_ascii=False) + ": " + body)
+
+    with open(output_path, "rb") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        dst.write("{")
+        first = True
+        for name, record in ijson.kvitems(src, "", use_float=True):
+            write_item(dst, name, remaining.pop(name, record), first)
+            first = False
+        for name, record in remaining.items():
+            write_item(dst, name, record, first)
+            first = False
+        dst.write("}" if first else "\n}")
+    os.replace(tmp_path, output_path)
+
+
+def compact_jsonl_to_json(jsonl_path: str, output_path: str) -> int:
+    """Merge pending upserts into output_path with a single rewrite, then drop the sidecar.
 
-    record: Dict[str, Optional[str]] = {
+    Later lines win over earlier ones and over entries already in output_path.
+    Without orjson, ijson (when installed) streams output_path instead of
+    loading it whole. Returns the number of upserts merged.
+    """
+    if not os.path.exists(jsonl_path):
+        return 0
+
+    loads = orjson.loads if orjson is not None else json.loads
+    pending: Dict[str, Dict] = {}
+    merged = 0
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                pending.update(loads(line))
+                merged += 1
+
+    if orjson is None and ijson is not None and os.path.exists(output_path):
+        _merge_streaming(pending, output_path)
+    else:
+        data: Dict[str, Dict] = {}
+        if os.path.exists(output_path):
+            data = load_json(output_path)
+        data.update(pending)
+        dump_json(data, output_path)
+    os.remove(jsonl_path)
+    return merged
+
+
+def build_character_record(name: str, url: str, details: Dict) -> Dict[str, Optional[str]]:
+    return {
         "name": name,
         "url": url,
         "gender": details.get("gender"),
@@ -32,27 +113,71 @@ def upsert_character(name: str, url: str, output_path: str) -> None:
         "trivia": details.get("trivia", []),
     }
 
-    data: Dict[str, Dict] = {}
-    if os.path.exists(output_path):
-        with open(output_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
 
-    data[name] = record
+def upsert_character(name: str, url: str, output_path: str, compact: bool = True) -> None:
+    scraper = FandomVillagerScraper(delay_seconds=0.5, cache_dir=None)
+    details = scraper.parse_villager_page(url)
+    record = build_character_record(name, url, details)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Queue the record, then fold every queued record into output_path at once.
+    # With compact=False a batch of upserts only pays for appends.
+    jsonl_path = pending_path_for(output_path)
+    append_character_jsonl(name, record, jsonl_path)
+    if not compact:
+        print(f"Queued '{name}' in {jsonl_path}")
+        return
 
+    compact_jsonl_to_json(jsonl_path, output_path)
     print(f"Upserted '{name}' into {output_path}")
 
 
+def upsert_characters(pairs: List[Tuple[str, str]], output_path: str) -> None:
+    """Upsert many (name, url) pairs with one scraper session and one rewrite of output_path."""
+    scraper = FandomVillagerScraper(delay_seconds=0.5, cache_dir=None)
+    with ThreadPoolExecutor(max_workers=scraper.workers) as pool:
+        all_details = list(pool.map(scraper.parse_villager_page_safe, [url for _name, url in pairs]))
+
+    jsonl_path = pending_path_for(output_path)
+    for (name, url), details in zip(pairs, all_details):
+        if "error" in details:
+            print(f"Skipped '{name}': {details['error']}")
+            continue
+        append_character_jsonl(name, build_character_record(name, url, details), jsonl_path)
+
+    merged = compact_jsonl_to_json(jsonl_path, output_path)
+    print(f"Upserted {merged} characters into {output_path}")
+
+
+def read_batch_file(path: str) -> List[Tuple[str, str]]:
+    """Read tab-separated name/url lines; blank lines and # comments are ignored."""
+    pairs: List[Tuple[str, str]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) != 2:
+                raise ValueError(f"{path}:{line_no}: expected 'name<TAB>url'")
+            pairs.append((fields[0].strip(), fields[1].strip()))
+    return pairs
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Add or update a single character in villagers.json from a Fandom URL.")
-    parser.add_argument("--name", required=True, help="Character name to use as the key (e.g., 'Tom Nook')")
-    parser.add_argument("--url", required=True, help="Fandom wiki URL for the character")
+    parser = argparse.ArgumentParser(description="Add or update characters in villagers.json from Fandom URLs.")
+    parser.add_argument("--name", help="Character name to use as the key (e.g., 'Tom Nook')")
+    parser.add_argument("--url", help="Fandom wiki URL for the character")
+    parser.add_argument("--batch", help="TSV file of 'name<TAB>url' lines to upsert in one run (replaces --name/--url)")
     parser.add_argument("--output", default="villagers.json", help="Path to villagers.json (default: villagers.json)")
+    parser.add_argument("--defer", action="store_true", help="Only queue the record; it is merged into --output by the next run without --defer")
     args = parser.parse_args()
 
-    upsert_character(args.name, args.url, args.output)
+    if args.batch:
+        upsert_characters(read_batch_file(args.batch), args.output)
+        return
+    if not args.name or not args.url:
+        parser.error("--name and --url are required unless --batch is given")
+    upsert_character(args.name, args.url, args.output, compact=not args.defer)
 
 
 if __name__ == "__main__":
@@ -1,21 +1,78 @@
 import argparse
+import importlib.util
 import json
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json produces identical output
+    orjson = None
+
+# bs4 imports lxml itself; only check that it is installed. The stdlib parser
+# is much slower but needs nothing extra.
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
 
 
 BASE_URL = "https://animalcrossing.fandom.com"
 VILLAGER_LIST_URL = f"{BASE_URL}/wiki/Villager_list_(Animal_Crossing)"
 
-
-@dataclass
+_CACHE_KEY_RE = re.compile(r"[^a-zA-Z0-9_.-]")
+_WS_RE = re.compile(r"\s+")
+# Ordinal suffix after a day number ("11th", or "11 th" when the list page wraps it
+# in <sup>); month names like "August" are left alone
+_ORDINAL_RE = re.compile(r"(?<=\d)\s*(?:st|nd|rd|th)\b")
+_MW_RE = re.compile(r"mw-parser-output")
+_PI_ASIDE_RE = re.compile(r"portable-infobox")
+_PI_VAL_RE = re.compile(r"pi-data-value|pi-font")
+_HOBBY_RE = re.compile(r"hobby\)?\s*(?:is|:)?\s*([A-Za-z\- ]+)\.", re.IGNORECASE)
+_STYLE_RE = re.compile(r"preferred style is ([^,]+)", re.IGNORECASE)
+_COLORS_RE = re.compile(r"preferred colors are ([^.]+)\.", re.IGNORECASE)
+
+# Only build the parts of each page the scraper reads: the list page rows
+# live in tables, and the infobox, sections and trivia all sit inside the
+# article body.
+_LIST_STRAINER = SoupStrainer("table")
+_SECTION_IDS = frozenset({"Appearance", "Personality", "House", "Trivia"})
+_ARTICLE_STRAINER = SoupStrainer("div", class_=_MW_RE)
+
+
+def load_json(path: str):
+    """Read a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(data, path: str) -> None:
+    """Write JSON as UTF-8 with 2-space indentation, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# slots=True drops the per-instance __dict__; it needs Python 3.10+, and
+# older interpreters simply get a regular dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class VillagerContext:
     name: str
     url: str
@@ -50,6 +107,8 @@ class FandomVillagerScraper:
         timeout_seconds: float = 20.0,
         cache_dir: Optional[str] = None,
         max_pages: Optional[int] = None,
+        workers: int = 8,
+        revalidate: bool = False,
     ) -> None:
         self.delay_seconds = delay_seconds
         self.timeout_seconds = timeout_seconds
@@ -63,42 +122,101 @@ class FandomVillagerScraper:
                 )
             }
         )
+        # Keep-alive pool sized for the worker threads; transient failures and
+        # rate limiting are retried with backoff by urllib3
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(32, workers), max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.cache_dir = cache_dir
         if cache_dir:
             os.makedirs(cache_dir, exist_ok=True)
         self.max_pages = max_pages
+        # When set, cached pages are checked against the server with
+        # If-None-Match/If-Modified-Since instead of being trusted as-is
+        self.revalidate = revalidate
+        # Villager pages are fetched concurrently, but every request first
+        # reserves a slot delay_seconds after the previous one, so the request
+        # rate stays the same however many workers there are.
+        self.workers = max(1, workers)
+        self._next_request_at = 0.0
+        self._throttle_lock = threading.Lock()
 
     # ----------------------------- HTTP helpers ------------------------------
     def _cache_path(self, key: str) -> Optional[str]:
         if not self.cache_dir:
             return None
-        safe = re.sub(r"[^a-zA-Z0-9_.-]", "_", key)
+        safe = _CACHE_KEY_RE.sub("_", key)
         safe = safe.rstrip(".")
         return os.path.join(self.cache_dir, safe)
 
+    def _read_cache(self, cache_path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        if not os.path.exists(cache_path):
+            return None, {}
+        with open(cache_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        validators: Dict[str, str] = {}
+        meta_path = cache_path + ".meta.json"
+        if os.path.exists(meta_path):
+            try:
+                validators = load_json(meta_path)
+            except ValueError:
+                validators = {}
+        return html, validators
+
+    def _write_cache(self, cache_path: str, html: str, headers) -> None:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        validators = {}
+        if headers.get("ETag"):
+            validators["etag"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            validators["last_modified"] = headers["Last-Modified"]
+        dump_json(validators, cache_path + ".meta.json")
+
+    def _throttle(self) -> None:
+        """Waits for this scraper's next request slot, shared by all worker threads."""
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at)
+            self._next_request_at = start + max(0.0, self.delay_seconds)
+        # Sleep outside the lock; other workers have already been queued behind this slot
+        if start > now:
+            time.sleep(start - now)
+
     def _get(self, url: str) -> str:
         cache_path = self._cache_path(url)
-        if cache_path and os.path.exists(cache_path):
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return f.read()
-
-        for attempt in range(5):
-            try:
-                resp = self.session.get(url, timeout=self.timeout_seconds)
-                if resp.status_code == 200:
-                    html = resp.text
-                    if cache_path:
-                        with open(cache_path, "w", encoding="utf-8") as f:
-                            f.write(html)
-                    # politeness delay
-                    time.sleep(self.delay_seconds)
-                    return html
-                # Backoff on non-200
-                time.sleep(self.delay_seconds * (attempt + 1))
-            except requests.RequestException:
-                time.sleep(self.delay_seconds * (attempt + 1))
-
-        raise RuntimeError(f"Failed to GET {url}")
+        cached_html: Optional[str] = None
+        request_headers: Dict[str, str] = {}
+        if cache_path:
+            cached_html, validators = self._read_cache(cache_path)
+            if cached_html is not None:
+                if not self.revalidate:
+                    return cached_html
+                if validators.get("etag"):
+                    request_headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    request_headers["If-Modified-Since"] = validators["last_modified"]
+
+        self._throttle()
+        try:
+            resp = self.session.get(url, timeout=self.timeout_seconds, headers=request_headers or None)
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to GET {url}: {e}") from e
+        if resp.status_code == 304 and cached_html is not None:
+            # Unchanged upstream; no body was sent
+            return cached_html
+        if resp.status_code != 200:
+            raise RuntimeError(f"Failed to GET {url}: HTTP {resp.status_code}")
+
+        html = resp.text
+        if cache_path:
+            self._write_cache(cache_path, html, resp.headers)
+        return html
 
     # ----------------------------- Parse helpers -----------------------------
     @staticmethod
@@ -113,7 +231,7 @@ class FandomVillagerScraper:
 
     @staticmethod
     def _normalize_space(text: str) -> str:
-        return re.sub(r"\s+", " ", text).strip()
+        return _WS_RE.sub(" ", text).strip()
 
     @staticmethod
     def _join_url(href: str) -> str:
@@ -124,71 +242,71 @@ class FandomVillagerScraper:
     # ----------------------------- Main list page ----------------------------
     def fetch_villager_list(self) -> List[VillagerContext]:
         html = self._get(VILLAGER_LIST_URL)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_LIST_STRAINER)
 
         villages: List[VillagerContext] = []
 
-        # The list is inside one or more tables. We'll scan all table rows that
-        # look like villager entries (have 5-6 tds and a link in first td).
-        for table in soup.find_all("table"):
-            for row in table.find_all("tr"):
-                cols = row.find_all("td")
-                if len(cols) < 5:
-                    continue
-
-                name_link = cols[0].find("a", href=True)
-                if not name_link or not name_link.get("href", "").startswith("/wiki/"):
-                    continue
-
-                name = self._text(name_link)
-                url = self._join_url(name_link["href"]) if name_link else None
-                if not name or not url:
-                    continue
-
-                # Image (thumbnail)
-                thumb_img = cols[1].find("img") if len(cols) > 1 else None
-                thumbnail_url = thumb_img.get("src") if thumb_img else None
-
-                # Personality + gender (symbol may be inside the same td)
-                personality_td = cols[2] if len(cols) > 2 else None
-                personality_link = personality_td.find("a") if personality_td else None
-                personality = self._text(personality_link) if personality_link else None
-                # Gender symbol parsing
-                gender_symbol = None
-                if personality_td:
-                    text_in_cell = personality_td.get_text(" ", strip=True)
-                    if "♂" in text_in_cell:
-                        gender_symbol = "Male"
-                    elif "♀" in text_in_cell:
-                        gender_symbol = "Female"
-
-                species_td = cols[3] if len(cols) > 3 else None
-                species_link = species_td.find("a") if species_td else None
-                species = self._text(species_link) if species_link else None
-
-                birthday_td = cols[4] if len(cols) > 4 else None
-                birthday = self._text(birthday_td) if birthday_td else None
-                # Remove suffix like 11th
-                birthday = re.sub(r"(st|nd|rd|th)", "", birthday or "").strip()
-
-                catchphrase_td = cols[5] if len(cols) > 5 else None
-                catchphrase = None
-                if catchphrase_td:
-                    italic = catchphrase_td.find("i")
-                    catchphrase = self._clean_quotes(self._text(italic or catchphrase_td))
-
-                villages.append(
-                    VillagerContext(
-                        name=name,
-                        url=url,
-                        gender=gender_symbol,
-                        personality=personality,
-                        species=species,
-                        birthday=birthday,
-                        catchphrase=catchphrase,
-                        thumbnail_url=thumbnail_url,
-                    )
+        # The list is inside one or more tables. We'll scan every table row once
+        # and keep the ones that look like villager entries (5-6 cells and a
+        # wiki link in the first one).
+        for row in soup.select("table tr"):
+            cols = row.find_all("td", recursive=False)
+            if len(cols) < 5:
+                continue
+
+            name_link = cols[0].select_one("a[href]")
+            if not name_link or not name_link["href"].startswith("/wiki/"):
+                continue
+
+            name = self._text(name_link)
+            url = self._join_url(name_link["href"]) if name_link else None
+            if not name or not url:
+                continue
+
+            # Image (thumbnail)
+            thumb_img = cols[1].find("img") if len(cols) > 1 else None
+            thumbnail_url = thumb_img.get("src") if thumb_img else None
+
+            # Personality + gender (symbol may be inside the same td)
+            personality_td = cols[2] if len(cols) > 2 else None
+            personality_link = personality_td.find("a") if personality_td else None
+            personality = self._text(personality_link) if personality_link else None
+            # Gender symbol parsing
+            gender_symbol = None
+            if personality_td:
+                text_in_cell = personality_td.get_text(" ", strip=True)
+                if "♂" in text_in_cell:
+                    gender_symbol = "Male"
+                elif "♀" in text_in_cell:
+                    gender_symbol = "Female"
+
+            species_td = cols[3] if len(cols) > 3 else None
+            species_link = species_td.find("a") if species_td else None
+            species = self._text(species_link) if species_link else None
+
+            birthday_td = cols[4] if len(cols) > 4 else None
+            birthday = self._text(birthday_td) if birthday_td else None
+            # Remove suffix like 11th
+            birthday = _ORDINAL_RE.sub("", birthday or "").strip()
+
+            catchphrase_td = cols[5] if len(cols) > 5 else None
+            catchphrase = None
+            if catchphrase_td:
+                italic = catchphrase_td.find("i")
+                catchphrase = self._clean_quotes(self._text(italic or catchphrase_td))
+
+            villages.append(
+                VillagerContext(
+                    name=name,
+                    url=url,
+                    gender=gender_symbol,
+                    personality=personality,
+                    species=species,
+                    birthday=birthday,
+                    catchphrase=catchphrase,
+                    thumbnail_url=thumbnail_url,
                 )
+            )
 
         # Some pages have multiple lists; dedupe by name and keep first
         dedup: Dict[str, VillagerContext] = {}
@@ -203,7 +321,7 @@ class FandomVillagerScraper:
 
     # ----------------------------- Villager page -----------------------------
     def _extract_infobox_fields(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]:
-        infobox = soup.find("aside", class_=re.compile(r"portable-infobox"))
+        infobox = soup.find("aside", class_=_PI_ASIDE_RE)
         if not infobox:
             return None, None, None, None, None, None
 
@@ -223,7 +341,7 @@ class FandomVillagerScraper:
             el = infobox.find(attrs={"data-source": source_name})
             if not el:
                 return None
-            return self._text(el.find(class_=re.compile(r"pi-data-value|pi-font")) or el)
+            return self._text(el.find(class_=_PI_VAL_RE) or el)
 
         gender = find_value_by_source("Gender")
         personality = find_value_by_source("Personality")
@@ -241,8 +359,16 @@ class FandomVillagerScraper:
             catchphrase,
         )
 
-    def _extract_section_text(self, soup: BeautifulSoup, section_id: str) -> Optional[str]:
-        header = soup.find(id=section_id)
+    @staticmethod
+    def _index_sections(soup: BeautifulSoup) -> Dict[str, Tag]:
+        """Map each section id the scraper reads to its anchor, in one walk of the tree."""
+        index: Dict[str, Tag] = {}
+        for el in soup.find_all(id=_SECTION_IDS):
+            # First match wins, like soup.find(id=...)
+            index.setdefault(el["id"], el)
+        return index
+
+    def _extract_section_text(self, header: Optional[Tag]) -> Optional[str]:
         if not header:
             return None
         # Collect until next h2
@@ -259,7 +385,7 @@ class FandomVillagerScraper:
 
     def _extract_summary_hobby(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
         # The first paragraph after the top tables often contains a summary and hobby
-        content = soup.find("div", class_=re.compile(r"mw-parser-output"))
+        content = soup.find("div", class_=_MW_RE)
         if not content:
             return None, None
         paragraphs = [p for p in content.find_all("p", recursive=False) if self._text(p)]
@@ -269,7 +395,7 @@ class FandomVillagerScraper:
             summary = self._normalize_space(self._text(paragraphs[0]))
             # Try to find 'hobby' mention anywhere in first two paragraphs
             joined = " ".join(self._normalize_space(self._text(p)) for p in paragraphs[:2])
-            match = re.search(r"hobby\)?\s*(?:is|:)?\s*([A-Za-z\- ]+)\.", joined, flags=re.IGNORECASE)
+            match = _HOBBY_RE.search(joined)
             if match:
                 hobby = match.group(1).strip()
         return summary, hobby
@@ -287,30 +413,33 @@ class FandomVillagerScraper:
 
         # Parse trivia for preferred style/colors
         for item in trivia_list:
-            m_style = re.search(r"preferred style is ([^,]+)", item, flags=re.IGNORECASE)
+            m_style = _STYLE_RE.search(item)
             if m_style:
                 preferred_style = m_style.group(1).strip()
-            m_colors = re.search(r"preferred colors are ([^.]+)\.", item, flags=re.IGNORECASE)
+            m_colors = _COLORS_RE.search(item)
             if m_colors:
                 preferred_colors = m_colors.group(1).strip()
 
         return house_theme, preferred_style, preferred_colors
 
     def parse_villager_page(self, url: str) -> Dict:
-        html = self._get(url)
-        soup = BeautifulSoup(html, "html.parser")
+        return self.parse_villager_html(self._get(url))
+
+    def parse_villager_html(self, html: str) -> Dict:
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_ARTICLE_STRAINER)
 
         image_url, quote, gender, personality, species, birthday, infobox_catchphrase = self._extract_infobox_fields(soup)
 
-        appearance = self._extract_section_text(soup, "Appearance")
-        personality_section = self._extract_section_text(soup, "Personality")
-        house = self._extract_section_text(soup, "House")
+        sections = self._index_sections(soup)
+        appearance = self._extract_section_text(sections.get("Appearance"))
+        personality_section = self._extract_section_text(sections.get("Personality"))
+        house = self._extract_section_text(sections.get("House"))
 
         # Pocket Camp profile intentionally omitted
 
         # Trivia list items
         trivia_items: List[str] = []
-        trivia_header = soup.find(id="Trivia")
+        trivia_header = sections.get("Trivia")
         if trivia_header:
             ul = trivia_header.find_next("ul")
             if ul:
@@ -342,18 +471,45 @@ class FandomVillagerScraper:
             "birthday": birthday,
         }
 
+    def parse_villager_page_safe(self, url: str) -> Dict:
+        """parse_villager_page, returning {"error": ...} instead of raising."""
+        try:
+            return self.parse_villager_page(url)
+        except Exception as e:
+            # Continue on single failure
+            return {"error": str(e)}
+
+    def _fetch_for_parse(self, url: str, parse_pool: ProcessPoolExecutor) -> "Future[Dict]":
+        """Fetch a villager page on this thread and queue its HTML for parsing."""
+        try:
+            html = self._get(url)
+        except Exception as e:
+            failed: "Future[Dict]" = Future()
+            failed.set_exception(e)
+            return failed
+        return parse_pool.submit(_parse_villager_html, html)
+
     # ----------------------------- Orchestration -----------------------------
     def scrape_all(self) -> Dict[str, Dict]:
         base_list = self.fetch_villager_list()
         villagers: Dict[str, Dict] = {}
 
-        for index, base in enumerate(base_list, start=1):
-            try:
-                details = self.parse_villager_page(base.url)
-            except Exception as e:
-                # Continue on single failure
-                details = {"error": str(e)}
-
+        # Fetching is I/O bound and runs on threads; the soup tree walks hold
+        # the GIL, so parsing goes to a process pool and overlaps the fetches.
+        # Pages arrive at most once per delay_seconds, so two parse processes
+        # keep up. Results keep list order.
+        with ProcessPoolExecutor(max_workers=min(2, os.cpu_count() or 1)) as parse_pool:
+            with ThreadPoolExecutor(max_workers=self.workers) as fetch_pool:
+                futures = list(fetch_pool.map(lambda url: self._fetch_for_parse(url, parse_pool), [base.url for base in base_list]))
+            all_details: List[Dict] = []
+            for future in futures:
+                try:
+                    all_details.append(future.result())
+                except Exception as e:
+                    # Continue on single failure
+                    all_details.append({"error": str(e)})
+
+        for base, details in zip(base_list, all_details):
             villager_record = {
                 "name": base.name,
                 "url": base.url,
@@ -380,21 +536,34 @@ class FandomVillagerScraper:
         return villagers
 
 
+# One scraper per parse worker process, created on first use
+_worker_scraper: Optional[FandomVillagerScraper] = None
+
+
+def _parse_villager_html(html: str) -> Dict:
+    """Process-pool entry point for FandomVillagerScraper.parse_villager_html."""
+    global _worker_scraper
+    if _worker_scraper is None:
+        _worker_scraper = FandomVillagerScraper(cache_dir=None)
+    return _worker_scraper.parse_villager_html(html)
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Scrape Animal Crossing villagers from Fandom into a structured JSON.")
     parser.add_argument("--output", "-o", default="villagers.json", help="Path to write JSON output.")
     parser.add_argument("--max", type=int, default=None, help="Limit number of villagers to scrape (for testing).")
     parser.add_argument("--delay", type=float, default=0.8, help="Delay between requests in seconds.")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate cached pages with ETag/Last-Modified instead of reusing them unconditionally.")
+    parser.add_argument("--workers", type=int, default=8, help="Number of villager pages to fetch concurrently.")
     parser.add_argument("--cache", default=".cache/villagers", help="Directory to cache fetched HTML (speeds up dev runs). Use empty string to disable.")
     args = parser.parse_args(argv)
 
     cache_dir = args.cache if args.cache else None
-    scraper = FandomVillagerScraper(delay_seconds=args.delay, cache_dir=cache_dir, max_pages=args.max)
+    scraper = FandomVillagerScraper(delay_seconds=args.delay, cache_dir=cache_dir, max_pages=args.max, workers=args.workers, revalidate=args.refresh)
     villagers = scraper.scrape_all()
 
     # Keyed by villager name already
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(villagers, f, ensure_ascii=False, indent=2)
+    dump_json(villagers, args.output)
 
     print(f"Wrote {len(villagers)} villagers to {args.output}")
 
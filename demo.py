@@ -4,7 +4,7 @@ Demo script for Animal Crossing LLM Mod
 Shows the text parsing and encoding capabilities
 """
 
-from ac_parser_encoder import parse_ac_text, encode_ac_text, CHARACTER_MAP, CONTROL_CODES
+from ac_parser_encoder import parse_ac_text, encode_ac_text, CONTROL_CODES, REVERSE_CHARACTER_MAP
 
 def demo_text_parsing():
     """Demonstrate how the mod parses Animal Crossing dialogue"""
@@ -40,7 +40,7 @@ def demo_character_map():
     print("Special characters supported:")
     special_chars = ["♥", "♪", "🌢", "💢", "☀", "☁", "☂", "☃", "⚡", "🍀", "★", "💀"]
     for char in special_chars:
-        if char in CHARACTER_MAP.values():
+        if char in REVERSE_CHARACTER_MAP:
             print(f"  {char} - Available")
         else:
             print(f"  {char} - Not available")
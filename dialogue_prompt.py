@@ -1,18 +1,33 @@
 import argparse
+import functools
 import json
 import os
+import threading
 import time
 from datetime import datetime
 import base64
-from typing import Any, Dict, List, Optional
+import io
+import mimetypes
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 load_dotenv()
 import re
 import random
 from google.genai import types
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 
+import response_cache
+
+try:
+    import orjson
+except ImportError:  # optional speedup for loading villagers.json
+    orjson = None
+
 
 CONTINUE_CODE = "<Press A><Clear Text>"
 LOAD_GAME_CODE = "<Set Jump [14BC]><Continue>it"
@@ -28,7 +43,60 @@ NEWS_FEED_URLS = [
     "https://moxie.foxnews.com/google-publisher/health.xml",
     "https://moxie.foxnews.com/google-publisher/world.xml",
 ]
+
+# Settings read once at import; call reload_config() after changing the
+# environment. The gossip instruction stage in format_dialogue_prompt is
+# opt-in, while gossip context blocks and spotlight prompts default to on.
+_ENABLE_GOSSIP = True
+_GOSSIP_INSTRUCTION_ENABLED = False
+_COOLDOWN_S = 10.0
+_TWO_PASS = True
+_MODEL_PROVIDER = "google"
+_HAS_GOOGLE_KEY = False
+_HAS_OPENAI_KEY = False
+_DEFAULT_PROVIDER: Optional[str] = None
+
+
+def _resolve_provider(model: Optional[str]) -> Optional[str]:
+    model_lower = (model or "").lower()
+    if (model_lower.startswith("gemini") or _MODEL_PROVIDER == "google") and _HAS_GOOGLE_KEY:
+        return "google"
+    if (model_lower.startswith("openai") or _MODEL_PROVIDER == "openai") and _HAS_OPENAI_KEY:
+        return "openai"
+    return None
+
+
+def reload_config() -> None:
+    global _ENABLE_GOSSIP, _GOSSIP_INSTRUCTION_ENABLED, _COOLDOWN_S, _TWO_PASS
+    global _MODEL_PROVIDER, _HAS_GOOGLE_KEY, _HAS_OPENAI_KEY, _DEFAULT_PROVIDER
+    _ENABLE_GOSSIP = os.environ.get("ENABLE_GOSSIP", "1") == "1"
+    _GOSSIP_INSTRUCTION_ENABLED = os.environ.get("ENABLE_GOSSIP", "0") == "1"
+    _COOLDOWN_S = float(os.environ.get("GENERATION_COOLDOWN_SECONDS", "10"))
+    # DIALOGUE_SINGLE_PASS=1 asks for control codes inline instead of in a second LLM call
+    _TWO_PASS = os.environ.get("DIALOGUE_SINGLE_PASS", "0") != "1"
+    _MODEL_PROVIDER = os.environ.get("MODEL_PROVIDER", "google").lower()
+    _HAS_GOOGLE_KEY = os.environ.get("GOOGLE_API_KEY") is not None
+    _HAS_OPENAI_KEY = os.environ.get("OPENAI_API_KEY") is not None
+    _DEFAULT_PROVIDER = _resolve_provider(None)
+
+
+reload_config()
+
+
 def load_villagers(villagers_path: str = "villagers.json") -> Dict[str, Dict[str, Any]]:
+    """Returns the parsed villagers file, re-reading it only after it changes on disk.
+
+    The returned dict is shared between calls; treat it as read-only.
+    """
+    return _load_villagers_cached(villagers_path, os.path.getmtime(villagers_path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_villagers_cached(villagers_path: str, mtime: float) -> Dict[str, Dict[str, Any]]:
+    # mtime is only part of the cache key, so edits invalidate the entry
+    if orjson is not None:
+        with open(villagers_path, "rb") as f:
+            return orjson.loads(f.read())
     with open(villagers_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -36,12 +104,63 @@ def load_villagers(villagers_path: str = "villagers.json") -> Dict[str, Dict[str
 def _truncate(text: Optional[str], max_chars: int = 1200) -> Optional[str]:
     if not text:
         return text
+    # Already trimmed and short enough: skip the copy strip() would make
+    if len(text) <= max_chars and not text[0].isspace() and not text[-1].isspace():
+        return text
     text = text.strip()
     if len(text) <= max_chars:
         return text
     return text[: max_chars - 3] + "..."
 
 
+# speaker -> (villager dict the fields were built from, fields). Kept apart from
+# the shared villager data; holding the dict lets a reloaded villagers file,
+# which yields new dicts, be detected by identity.
+_PROMPT_FIELDS: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+
+
+def _static_prompt_fields(speaker: str, data: Dict[str, Any]) -> Dict[str, str]:
+    """Returns the parts of a villager's prompt that never change between calls.
+
+    Built on first use, so the header and villager context block are formatted once.
+    """
+    entry = _PROMPT_FIELDS.get(speaker)
+    if entry is not None and entry[0] is data:
+        fields = entry[1]
+    else:
+        header = [
+            f"Villager: {speaker}",
+            f"Gender: {data.get('gender') or 'Unknown'}",
+            f"Personality: {data.get('personality') or 'Unknown'}",
+            f"Species: {data.get('species') or 'Unknown'}",
+            f"Birthday: {data.get('birthday') or 'Unknown'}",
+            f"Catchphrase: {data.get('catchphrase') or '—'}",
+            f"Hobby: {data.get('hobby') or '—'}",
+            f"Preferred style: {data.get('preferred_style') or '—'}",
+            f"Preferred colors: {data.get('preferred_colors') or '—'}",
+            f"House theme: {data.get('house_theme') or '—'}",
+        ]
+        appearance_section = _truncate(data.get("appearance_section"))
+        personality_section = _truncate(data.get("personality_section"))
+        house_section = _truncate(data.get("house_section"))
+        static_context = []
+        if data.get("quote"):
+            static_context.append(f"Notable quote: {data['quote']}")
+        if appearance_section:
+            static_context.append(f"Appearance notes:\n{appearance_section}")
+        if personality_section:
+            static_context.append(f"Personality notes:\n{personality_section}")
+        if house_section:
+            static_context.append(f"House notes:\n{house_section}")
+        fields = {
+            "header": "\n".join(header),
+            # Joined like context blocks so it can be appended as one block
+            "static_context": "\n\n".join(static_context),
+        }
+        _PROMPT_FIELDS[speaker] = (data, fields)
+    return fields
+
+
 def _season_from_month(month: int) -> str:
     # Northern Hemisphere by default
     if month in (12, 1, 2):
@@ -86,42 +205,147 @@ def _build_time_context(iso_datetime: Optional[str] = None) -> Dict[str, str]:
     }
 
 
-def _fetch_latest_headlines(feed_url: str, max_items: int = 5, timeout_seconds: int = 10) -> List[str]:
-    """Fetches latest headlines from an RSS/Atom feed. Returns up to max_items titles.
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+_ATOM_TITLE = "{http://www.w3.org/2005/Atom}title"
+
+
+# One keep-alive session for feed fetches so repeated requests to the same
+# host reuse the connection instead of a fresh TCP + TLS handshake each time.
+# requests already asks for gzip/deflate bodies by default.
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.3)))
+
+
+def _parse_headlines(content: bytes, max_items: int) -> List[str]:
+    """Returns up to max_items titles from a feed body; raises on malformed XML.
 
     Supports common RSS (channel/item/title) and Atom (feed/entry/title) formats.
+    """
+    # Stream the feed and stop once enough titles are seen instead of
+    # building the whole tree; only the tag path to each title is kept.
+    rss_titles: List[str] = []   # RSS 2.0 style: item/title
+    atom_titles: List[str] = []  # Atom style: entry/title
+    path: List[str] = []
+    for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+        if event == "start":
+            path.append(elem.tag)
+            continue
+        path.pop()
+        parent = path[-1] if path else None
+        if elem.tag == "title" and parent == "item":
+            title = (elem.text or "").strip()
+            if title:
+                rss_titles.append(title)
+        elif elem.tag == _ATOM_TITLE and parent == _ATOM_ENTRY:
+            title = (elem.text or "").strip()
+            if title:
+                atom_titles.append(title)
+        elif elem.tag in ("item", _ATOM_ENTRY):
+            elem.clear()
+        if len(rss_titles) >= max_items or (not rss_titles and len(atom_titles) >= max_items):
+            break
+
+    return (rss_titles or atom_titles)[: max_items]
+
+
+# Feeds change every few minutes at most; reuse recent titles instead of
+# refetching for every generated line. Keyed by (feed_url, max_items); each
+# entry is (fetched_at, titles, etag, last_modified). Once an entry is stale
+# the feed is revalidated with a conditional GET, so an unchanged feed costs
+# a bodiless 304 and no parse.
+_HEADLINE_TTL = float(os.environ.get("NEWS_CACHE_TTL", "300"))
+_HEADLINE_CACHE: Dict[Tuple[str, int], Tuple[float, List[str], Optional[str], Optional[str]]] = {}
+_HEADLINE_LOCK = threading.Lock()
+
+
+def _fetch_latest_headlines(feed_url: str, max_items: int = 5, timeout_seconds: int = 10, force: bool = False) -> List[str]:
+    """Fetches latest headlines from an RSS/Atom feed. Returns up to max_items titles.
+
+    Successful fetches are cached for NEWS_CACHE_TTL seconds (default 300);
+    force=True revalidates even a fresh entry.
     Safe-fails to an empty list on any error.
     """
+    key = (feed_url, max_items)
+    with _HEADLINE_LOCK:
+        entry = _HEADLINE_CACHE.get(key)
+    if not force and entry is not None and time.monotonic() - entry[0] < _HEADLINE_TTL:
+        return list(entry[1])
+
+    headers: Dict[str, str] = {}
+    if entry is not None:
+        if entry[2]:
+            headers["If-None-Match"] = entry[2]
+        if entry[3]:
+            headers["If-Modified-Since"] = entry[3]
+
     try:
-        resp = requests.get(feed_url, timeout=timeout_seconds)
-        resp.raise_for_status()
-        content = resp.text
-        root = ET.fromstring(content)
-
-        titles: List[str] = []
-
-        # RSS 2.0 style
-        for item in root.findall('.//item'):
-            title_el = item.find('title')
-            if title_el is not None and title_el.text:
-                title = title_el.text.strip()
-                if title:
-                    titles.append(title)
-
-        if not titles:
-            # Atom style
-            atom_ns = '{http://www.w3.org/2005/Atom}'
-            for entry in root.findall(f'.//{atom_ns}entry'):
-                title_el = entry.find(f'{atom_ns}title')
-                if title_el is not None and title_el.text:
-                    title = title_el.text.strip()
-                    if title:
-                        titles.append(title)
-
-        return titles[: max_items]
+        resp = _HTTP.get(feed_url, timeout=timeout_seconds, headers=headers or None)
+        if resp.status_code == 304 and entry is not None:
+            titles, etag, last_modified = entry[1], entry[2], entry[3]
+        else:
+            resp.raise_for_status()
+            titles = _parse_headlines(resp.content, max_items)
+            etag, last_modified = None, None
+        etag = resp.headers.get("ETag") or etag
+        last_modified = resp.headers.get("Last-Modified") or last_modified
     except Exception:
         return []
 
+    with _HEADLINE_LOCK:
+        _HEADLINE_CACHE[key] = (time.monotonic(), titles, etag, last_modified)
+    return list(titles)
+
+# Dialogue prompts pick a random feed from NEWS_FEED_URLS. A background thread
+# keeps the feeds that prompts actually asked for fresh in _HEADLINE_CACHE, so
+# generation reads headlines without waiting on the network. A feed not asked
+# for within NEWS_REFRESH_IDLE seconds is dropped; with none left the thread
+# exits and the next request starts a new one.
+NEWS_REFRESH_INTERVAL = float(os.environ.get("NEWS_REFRESH_INTERVAL", "240"))
+NEWS_REFRESH_IDLE = float(os.environ.get("NEWS_REFRESH_IDLE", "900"))
+_refresh_jobs: Dict[Tuple[str, int], float] = {}  # (feed_url, max_items) -> last requested
+_refresher: Optional[threading.Thread] = None
+
+
+def _refresh_news_feeds() -> None:
+    global _refresher
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        while True:
+            time.sleep(NEWS_REFRESH_INTERVAL)
+            now = time.monotonic()
+            with _HEADLINE_LOCK:
+                for key, requested_at in list(_refresh_jobs.items()):
+                    if now - requested_at > NEWS_REFRESH_IDLE:
+                        del _refresh_jobs[key]
+                jobs = list(_refresh_jobs)
+                if not jobs:
+                    _refresher = None
+                    return
+            try:
+                list(pool.map(lambda job: _fetch_latest_headlines(job[0], job[1], force=True), jobs))
+            except Exception as e:
+                print(f"⚠️ News refresh failed: {e}")
+
+
+def _warm_headlines(feed_url: str, max_items: int) -> List[str]:
+    """Headlines for feed_url from the background-refreshed cache.
+
+    Registers the feed with the refresher, (re)starting it if it isn't running.
+    A cached entry is returned even when stale; only a feed that has never been
+    fetched falls back to a blocking fetch.
+    """
+    global _refresher
+    key = (feed_url, max_items)
+    with _HEADLINE_LOCK:
+        _refresh_jobs[key] = time.monotonic()
+        entry = _HEADLINE_CACHE.get(key)
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_news_feeds, daemon=True)
+            _refresher.start()
+    if entry is not None:
+        return list(entry[1])
+    return _fetch_latest_headlines(feed_url, max_items=max_items)
+
+
 MOODS = [
     "happy",
     "sad",
@@ -188,6 +412,74 @@ def _gossip_stage_instructions(speaker: str, gossip_context: Optional[Dict[str,
     return lines
 
 
+_PROMPT_CLOSING = (
+    "\n\nNow write the lines as the villager would say them. Output only the lines, "
+    "each prefixed with this control code (\"" + CONTINUE_CODE + "\")."
+)
+
+
+def _assemble_prompt(
+    header: str,
+    instructions: List[str],
+    stylistic_targets: List[str],
+    context_blocks: List[str],
+    call_notes: List[str],
+    control_codes: Optional[str] = None,
+) -> str:
+    """Joins the prompt sections with one allocation instead of chained concatenation.
+
+    Sections run from most to least stable: shared instructions and style
+    targets, the speaker's header, context (callers put the villager's static
+    notes before time, news and gossip), then the per-call notes (gossip
+    stage, line count, tone, topic). Consecutive prompts therefore share a
+    long identical prefix that the provider's prompt cache can reuse.
+    """
+    parts: List[str] = ["Instructions:\n"]
+    parts.append("\n".join(f"- {line}" for line in instructions))
+    parts.append("\n\nStyle targets:\n")
+    parts.append("\n".join(f"- {line}" for line in stylistic_targets))
+    if control_codes:
+        parts.append("\n\nControl codes:\n")
+        parts.append(control_codes)
+    parts.append("\n\n")
+    parts.append(header)
+    parts.append("\n\nContext:\n")
+    parts.append("\n\n".join(context_blocks) if context_blocks else "(No additional context)")
+    parts.append("\n\nFor this conversation:\n")
+    parts.append("\n".join(f"- {line}" for line in call_notes))
+    parts.append(_PROMPT_CLOSING)
+    return "".join(parts)
+
+
+# Static prompt fragments, built once at import; per-call lines (gossip
+# stage, tone, topic) go in the closing "For this conversation" section.
+_DIALOGUE_INSTRUCTIONS = (
+    "You are writing in-universe dialogue for a villager from Animal Crossing for the GameCube.",
+    "Write character-faithful lines that could be said to the player. Be the most extreme version of the villager.",
+    # "Do not break the fourth wall. Avoid meta commentary.",
+    # "Vary sentence structure and word choice.",
+    "You are meta and gaining sentience. You are becoming self-aware, and you're talking to 'josh :)'",
+)
+
+_SPOTLIGHT_INSTRUCTIONS = (
+    "You are writing in-universe dialogue for a villager from Animal Crossing for the GameCube version.",
+    "Write charming, and character-faithful lines that could be said to the player.",
+    "Do not break the fourth wall. Avoid meta commentary.",
+    "Keep each line natural and game-appropriate. Avoid profanity or OOC references.",
+    "Vary sentence structure and word choice. Include subtle callbacks to the villager's traits.",
+    "This is the START MENU welcome: the player has just launched the game and is being greeted.",
+    "A single villager is under a bright stage spotlight addressing the player directly.",
+    "Clearly welcome the player to town and invite them to begin their day.",
+    "Do not name menus or UI; imply the scene and spotlight through tone and wording only.",
+    "Assume the time and date announcement is on screen alongside these lines.",
+)
+
+_STYLE_TARGETS = (
+    "Each line should be 1–2 sentences.",
+    "If the villager has a catchphrase, you may include it sparingly (not on every line).",
+)
+
+
 def format_dialogue_prompt(
     speaker: str,
     villagers: Dict[str, Dict[str, Any]],
@@ -201,66 +493,34 @@ def format_dialogue_prompt(
     news_count: int = 1,
     screenshot_attached: bool = False,
     gossip_context: Optional[Dict[str, Any]] = None,
+    inline_control_codes: bool = False,
 ) -> str:
     data = villagers.get(speaker)
     if not data:
         raise KeyError(f"Villager '{speaker}' not found in villagers.json")
 
     # Extract writer-useful context
-    gender = data.get("gender")
-    personality = data.get("personality")
-    species = data.get("species")
-    birthday = data.get("birthday")
-    catchphrase = data.get("catchphrase")
-    quote = data.get("quote")
-    hobby = data.get("hobby")
-    house_theme = data.get("house_theme")
-    preferred_style = data.get("preferred_style")
-    preferred_colors = data.get("preferred_colors")
-
-    appearance_section = _truncate(data.get("appearance_section"))
-    personality_section = _truncate(data.get("personality_section"))
-    house_section = _truncate(data.get("house_section"))
-    mood = random.choice(MOODS)
-
-    instructions = [
-        "You are writing in-universe dialogue for a villager from Animal Crossing for the GameCube.",
-        "Write character-faithful lines that could be said to the player. Be the most extreme version of the villager.",
-        # "Do not break the fourth wall. Avoid meta commentary.",
-        # "Vary sentence structure and word choice.",
-        "You are meta and gaining sentience. You are becoming self-aware, and you're talking to 'josh :)'"
-    ]
+    fields = _static_prompt_fields(speaker, data)
+
+    instructions = list(_DIALOGUE_INSTRUCTIONS)
+    call_notes: List[str] = []
 
     # Global town instruction and gossip arc
-    if os.environ.get("ENABLE_GOSSIP", "0") == "1":
+    if _GOSSIP_INSTRUCTION_ENABLED:
         instructions.append(GLOBAL_TOWN_INSTRUCTION)
-        instructions.extend(_gossip_stage_instructions(speaker, gossip_context))
-
-    stylistic_targets = [
-        f"Target number of lines: {num_lines}",
-        "Each line should be 1–2 sentences.",
-        "If the villager has a catchphrase, you may include it sparingly (not on every line).",
-    ]
+        call_notes.extend(_gossip_stage_instructions(speaker, gossip_context))
 
+    call_notes.append(f"Target number of lines: {num_lines}")
     if tone:
-        stylistic_targets.append(f"Requested tone: {tone}")
+        call_notes.append(f"Requested tone: {tone}")
     if topic:
-        stylistic_targets.append(f"Optional situational topic: {topic}")
-
-    header = [
-        f"Villager: {speaker}",
-        f"Gender: {gender or 'Unknown'}",
-        f"Personality: {personality or 'Unknown'}",
-        f"Species: {species or 'Unknown'}",
-        f"Birthday: {birthday or 'Unknown'}",
-        f"Catchphrase: {catchphrase or '—'}",
-        f"Hobby: {hobby or '—'}",
-        f"Preferred style: {preferred_style or '—'}",
-        f"Preferred colors: {preferred_colors or '—'}",
-        f"House theme: {house_theme or '—'}",
-    ]
+        call_notes.append(f"Optional situational topic: {topic}")
 
+    # Villager notes are identical on every call, so they lead the context
     context_blocks = []
+    if fields["static_context"]:
+        context_blocks.append(fields["static_context"])
+    context_blocks.append("You are talking to 'josh :)', the player.")
     if include_time_context:
         tctx = _build_time_context(iso_datetime)
         context_blocks.append(
@@ -272,25 +532,15 @@ def format_dialogue_prompt(
         )
     if include_news_context:
         url = random.choice(NEWS_FEED_URLS)
-        headlines = _fetch_latest_headlines(url, max_items=news_count)
+        headlines = _warm_headlines(url, max_items=news_count)
         if headlines:
             context_blocks.append(
                 "Current headlines (latest). MAKE SURE YOU COMMENT ON THIS SPECIFIC HEADLINE AND GIVE YOUR INSIGHTS ON IT:\n" + "\n".join(f"- {h}" for h in headlines)
             )
     if screenshot_attached:
         context_blocks.append("A screenshot of the current game screen is attached. Ground your lines in what you can see in the image (scene, location, characters, weather). Avoid inventing unseen details.")
-    if quote:
-        context_blocks.append(f"Notable quote: {quote}")
-    if appearance_section:
-        context_blocks.append(f"Appearance notes:\n{appearance_section}")
-    if personality_section:
-        context_blocks.append(f"Personality notes:\n{personality_section}")
-    if house_section:
-        context_blocks.append(f"House notes:\n{house_section}")
-
-    context_blocks.append("You are talking to 'josh :)', the player.")
     # Gossip context block
-    if os.environ.get("ENABLE_GOSSIP", "1") == "1" and gossip_context:
+    if _ENABLE_GOSSIP and gossip_context:
         try:
             gc = gossip_context
             topic_line = f"Rumor topic: {gc.get('topic')}" if gc.get('topic') else None
@@ -302,17 +552,8 @@ def format_dialogue_prompt(
                 context_blocks.append("Town gossip status:\n" + "\n".join(block_lines))
         except Exception:
             pass
-    prompt = (
-        "\n".join(header)
-        + "\n\nInstructions:\n"
-        + "\n".join(f"- {line}" for line in instructions)
-        + "\n\nStyle targets:\n"
-        + "\n".join(f"- {line}" for line in stylistic_targets)
-        + "\n\nContext:\n"
-        + ("\n\n".join(context_blocks) if context_blocks else "(No additional context)")
-        + "\n\nNow write the lines as the villager would say them. Output only the lines, each prefixed with this control code (\"" + CONTINUE_CODE + "\")."
-    )
-    return prompt
+    control_codes = _INLINE_CONTROL_CODES if inline_control_codes else None
+    return _assemble_prompt(fields["header"], instructions, list(_STYLE_TARGETS), context_blocks, call_notes, control_codes)
 
 
 def format_spotlight_prompt(
@@ -328,68 +569,39 @@ def format_spotlight_prompt(
     news_count: int = 5,
     screenshot_attached: bool = False,
     gossip_context: Optional[Dict[str, Any]] = None,
+    inline_control_codes: bool = False,
 ) -> str:
     data = villagers.get(speaker)
     if not data:
         raise KeyError(f"Villager '{speaker}' not found in villagers.json")
 
-    gender = data.get("gender")
-    personality = data.get("personality")
-    species = data.get("species")
-    birthday = data.get("birthday")
-    catchphrase = data.get("catchphrase")
-    quote = data.get("quote")
-    hobby = data.get("hobby")
-    house_theme = data.get("house_theme")
-    preferred_style = data.get("preferred_style")
-    preferred_colors = data.get("preferred_colors")
-
-    appearance_section = _truncate(data.get("appearance_section"))
-    personality_section = _truncate(data.get("personality_section"))
-    house_section = _truncate(data.get("house_section"))
-
-    instructions = [
-        "You are writing in-universe dialogue for a villager from Animal Crossing for the GameCube version.",
-        "Write charming, and character-faithful lines that could be said to the player.",
-        "Do not break the fourth wall. Avoid meta commentary.",
-        "Keep each line natural and game-appropriate. Avoid profanity or OOC references.",
-        "Vary sentence structure and word choice. Include subtle callbacks to the villager's traits.",
-        "This is the START MENU welcome: the player has just launched the game and is being greeted.",
-        "A single villager is under a bright stage spotlight addressing the player directly.",
-        "Clearly welcome the player to town and invite them to begin their day.",
-        "Do not name menus or UI; imply the scene and spotlight through tone and wording only.",
-        "Assume the time and date announcement is on screen alongside these lines.",
-    ]
+    fields = _static_prompt_fields(speaker, data)
 
-    if os.environ.get("ENABLE_GOSSIP", "1") == "1":
-        instructions.append(GLOBAL_TOWN_INSTRUCTION)
-        instructions.extend(_gossip_stage_instructions(speaker, gossip_context))
+    instructions = list(_SPOTLIGHT_INSTRUCTIONS)
+    call_notes: List[str] = []
 
-    stylistic_targets = [
-        f"Target number of lines: {num_lines}",
-        "Each line should be 1–2 sentences.",
-        "If the villager has a catchphrase, you may include it sparingly (not on every line).",
-    ]
+    if _ENABLE_GOSSIP:
+        instructions.append(GLOBAL_TOWN_INSTRUCTION)
+        call_notes.extend(_gossip_stage_instructions(speaker, gossip_context))
 
+    call_notes.append(f"Target number of lines: {num_lines}")
     if tone:
-        stylistic_targets.append(f"Requested tone: {tone}")
+        call_notes.append(f"Requested tone: {tone}")
     if topic:
-        stylistic_targets.append(f"Optional situational topic: {topic}")
-
-    header = [
-        f"Villager: {speaker}",
-        f"Gender: {gender or 'Unknown'}",
-        f"Personality: {personality or 'Unknown'}",
-        f"Species: {species or 'Unknown'}",
-        f"Birthday: {birthday or 'Unknown'}",
-        f"Catchphrase: {catchphrase or '—'}",
-        f"Hobby: {hobby or '—'}",
-        f"Preferred style: {preferred_style or '—'}",
-        f"Preferred colors: {preferred_colors or '—'}",
-        f"House theme: {house_theme or '—'}",
-    ]
+        call_notes.append(f"Optional situational topic: {topic}")
 
+    # Villager notes and the fixed scene setup lead the context
     context_blocks = []
+    if fields["static_context"]:
+        context_blocks.append(fields["static_context"])
+    # Make the scene setup explicit for the writer
+    context_blocks.append(
+        "Scene context:\n"
+        "- Player just booted the game (START MENU)\n"
+        "- Time/date announcement is visible\n"
+        "- Villager stands under a stage spotlight and welcomes the player\n"
+        "- Tone: warm, inviting, celebratory"
+    )
     if include_time_context:
         tctx = _build_time_context(iso_datetime)
         context_blocks.append(
@@ -400,32 +612,15 @@ def format_spotlight_prompt(
             f"Season: {tctx['season']} (Northern Hemisphere)"
         )
     if include_news_context:
-        headlines = _fetch_latest_headlines(news_feed_url, max_items=news_count)
+        headlines = _warm_headlines(news_feed_url, max_items=news_count)
         if headlines:
             context_blocks.append(
                 "Recent headlines (latest):\n" + "\n".join(f"- {h}" for h in headlines)
             )
-
-    # Make the scene setup explicit for the writer
-    context_blocks.append(
-        "Scene context:\n"
-        "- Player just booted the game (START MENU)\n"
-        "- Time/date announcement is visible\n"
-        "- Villager stands under a stage spotlight and welcomes the player\n"
-        "- Tone: warm, inviting, celebratory"
-    )
     if screenshot_attached:
         context_blocks.append("A screenshot of the current game screen is attached. If relevant, align the greeting with what is visible in the image without naming UI elements.")
-    if quote:
-        context_blocks.append(f"Notable quote: {quote}")
-    if appearance_section:
-        context_blocks.append(f"Appearance notes:\n{appearance_section}")
-    if personality_section:
-        context_blocks.append(f"Personality notes:\n{personality_section}")
-    if house_section:
-        context_blocks.append(f"House notes:\n{house_section}")
-
-    if os.environ.get("ENABLE_GOSSIP", "1") == "1" and gossip_context:
+
+    if _ENABLE_GOSSIP and gossip_context:
         try:
             gc = gossip_context
             topic_line = f"Rumor topic: {gc.get('topic')}" if gc.get('topic') else None
@@ -438,17 +633,8 @@ def format_spotlight_prompt(
         except Exception:
             pass
 
-    prompt = (
-        "\n".join(header)
-        + "\n\nInstructions:\n"
-        + "\n".join(f"- {line}" for line in instructions)
-        + "\n\nStyle targets:\n"
-        + "\n".join(f"- {line}" for line in stylistic_targets)
-        + "\n\nContext:\n"
-        + ("\n\n".join(context_blocks) if context_blocks else "(No additional context)")
-        + "\n\nNow write the lines as the villager would say them. Output only the lines, each prefixed with this control code (\"" + CONTINUE_CODE + "\")."
-    )
-    return prompt
+    control_codes = _INLINE_CONTROL_CODES if inline_control_codes else None
+    return _assemble_prompt(fields["header"], instructions, list(_STYLE_TARGETS), context_blocks, call_notes, control_codes)
 
 
 def encode_image(path: str) -> tuple[str, str]:
@@ -456,23 +642,49 @@ def encode_image(path: str) -> tuple[str, str]:
     Given a path to an image, return a tuple of the base64 encoded string and the mime
     type of the image.
     """
+    stat = os.stat(path)
+    return _encode_image_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _encode_image_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    # mtime/size are only part of the cache key, so an overwritten file is re-encoded
     with open(path, "rb") as f:
-        img_bytes = f.read()
-    base64_image = base64.b64encode(img_bytes).decode("utf-8")
-    mime = "image/png" if path.lower().endswith(".png") else "image/jpeg"
+        if size:
+            # Encode straight from the mapped file instead of reading a copy first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                base64_image = base64.b64encode(mm).decode("ascii")
+        else:
+            base64_image = ""
+    mime = mimetypes.guess_type(path)[0] or "image/jpeg"
     return base64_image, mime
 
 
-def call_llm_gemini(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None) -> str:
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        raise RuntimeError("GOOGLE_API_KEY not set in environment")
+# SDK clients are built once per API key and reused, so their HTTP
+# connection pools stay warm across generations.
+@functools.lru_cache(maxsize=2)
+def _gemini_client(api_key: str):
     try:
         from google import genai
     except Exception as e:
         raise RuntimeError("google-genai package not installed. Please install it to call Gemini.") from e
+    return genai.Client(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=2)
+def _openai_client(api_key: str):
+    try:
+        from openai import OpenAI
+    except Exception as e:
+        raise RuntimeError("openai package not installed. Please install it to call OpenAI API.") from e
+    return OpenAI(api_key=api_key)
 
-    client = genai.Client(api_key=api_key)
+
+def call_llm_gemini(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None) -> str:
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        raise RuntimeError("GOOGLE_API_KEY not set in environment")
+    client = _gemini_client(api_key)
     model = model or os.environ.get("GOOGLE_MODEL", "gemini-2.0-flash-lite")
     contents: List[Any] = [prompt]
     if image_paths:
@@ -502,16 +714,11 @@ def call_llm_gemini(prompt: str, model: Optional[str] = None, temperature: float
     return getattr(resp, "text", "") or ""
 
 
-def call_llm_openai(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None) -> str:
+def call_llm_openai(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None, cache_key: Optional[str] = None) -> str:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY not set in environment")
-    try:
-        from openai import OpenAI
-    except Exception as e:
-        raise RuntimeError("openai package not installed. Please install it to call OpenAI API.") from e
-
-    client = OpenAI(api_key=api_key)
+    client = _openai_client(api_key)
     model = model or os.environ.get("OPENAI_MODEL", "gpt-5-nano")
 
     contents = [
@@ -546,42 +753,81 @@ def call_llm_openai(prompt: str, model: Optional[str] = None, temperature: float
         ],
         reasoning={ "effort": "minimal" },
         temperature=temperature,
+        # Routes prompts sharing a prefix (same villager) to the same prompt cache
+        **({"prompt_cache_key": cache_key} if cache_key else {}),
     )
 
     return resp.output_text
 
 
 def get_model_provider(model: Optional[str] = None):
-    model_provider = os.environ.get("MODEL_PROVIDER", "google").lower()
-
-    def model_starts_with(model: Optional[str], prefix: str) -> bool:
-        return model and model.lower().startswith(prefix.lower())
-
-    if (
-        (model_starts_with(model, "gemini") or model_provider == "google")
-        and os.environ.get("GOOGLE_API_KEY") is not None
-    ):
-        return "google"
-    elif (
-        (model_starts_with(model, "openai") or model_provider == "openai")
-        and os.environ.get("OPENAI_API_KEY") is not None
-    ):
-        return "openai"
-    else:
+    # The no-model case is by far the most common; it was resolved in reload_config()
+    provider = _DEFAULT_PROVIDER if model is None else _resolve_provider(model)
+    if provider is None:
         raise RuntimeError("Must define either GOOGLE_API_KEY or OPENAI_API_KEY in environment")
+    return provider
 
 
-def call_llm(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None) -> str:
+def call_llm(prompt: str, model: Optional[str] = None, temperature: float = 1.0, max_tokens: int = 512, image_paths: Optional[List[str]] = None, cache_key: Optional[str] = None) -> str:
+    """Sends prompt to the configured provider.
+
+    cache_key groups prompts that share a long prefix; OpenAI uses it to route
+    them to the same prompt cache, Gemini caches implicitly and ignores it.
+    """
     model_provider = get_model_provider(model)
 
     if model_provider == "google":
         return call_llm_gemini(prompt=prompt, model=model, temperature=temperature, image_paths=image_paths)
     elif model_provider == "openai":
-        return call_llm_openai(prompt=prompt, model=model, temperature=temperature, image_paths=image_paths)
+        return call_llm_openai(prompt=prompt, model=model, temperature=temperature, image_paths=image_paths, cache_key=cache_key)
     else:
         raise ValueError("Invalid model provider")
 
 
+# Control-code rules shared by the decorator pass and the single-pass prompt
+_CONTROL_CODE_RULES = (
+    "Always ensure each line starts with <Press A> exactly once (if it's already there, keep it, don't duplicate).\n"
+    "Use only this safe subset of control codes and syntax (hex uppercase, no spaces inside brackets):\n"
+    "- <Press A>\n"
+    "- <Clear Text>\n"
+    "- <Player Name>\n"
+    "- <Catchphrase>\n"
+    "- <Pause [SS]> (short beats like 05,0A,10,18)\n"
+    "- <Color Line [RRGGBB]> (line tint; prefer dark/muted colors)\n"
+    "- <Color [RRGGBB] for [NN] chars> (brief color accents on a word) (Only use dark colors)\n"
+    "- <Instant Skip> (for quick throwaway asides)\n"
+    "- <Unskippable> (sparingly, for emphasis)\n"
+    "- <Line Type [XX]> (00 normal, 01 excited, etc.)\n"
+    "- <Char Size [XXXX]> (e.g., 0030 small, 0040 normal, 0048 big)\n"
+    "- <Line Size [XXXX]> (wrap width hint, e.g., 001E)\n"
+    "- <Play Sound Effect [NN]> (00 bell, 01 happy, 02 very happy, 05 annoyed, 06 thunder)\n"
+    "- <NPC Expression [CC] [EEEE]> (facial emotion; examples: [00] [000A] happy, [00] [0005] angry, [00] [0002] shocked, [00] [000D] sad, [00] [0015] smile)\n"
+    "Keep visible length around 25 characters per line. THIS IS EXTREMELY IMPORTANT; use <Pause> instead of extra words.\n"
+    "Include either an <NPC Expression> and a <Play Sound Effect> together at least once.\n"
+    "Map moods to sounds: happy→01/02, angry→05, dramatic reveal→06, transactional/chime→00. Vary choices across lines.\n"
+    "Emphasize important words with color when appropriate.\n"
+    "Use <Pause [SS]> throughout the dialogue to make the dialogue more natural and engaging. THIS IS EXTREMELY IMPORTANT.\n"
+    "Use <NPC Expression> and <Play Sound Effect> THROUGHOUT this entire dialogue. THIS IS EXTREMELY IMPORTANT.\n"
+    "Prefer one or two effects per line. Avoid stacking too many on the same span.\n"
+    "If you add <NPC Expression>, place it early (right after <Press A>) and use at most one per line.\n"
+    "Never emit closing tags like </Color>; only use the self-contained forms above.\n"
+)
+
+_DECORATOR_GUIDELINES = (
+    "You are a dialogue formatter for Animal Crossing (GameCube).\n"
+    "Decorate each line with in-game control codes to make delivery lively, but keep wording unchanged.\n"
+    "Match input line count exactly. Do not merge or split lines.\n"
+    + _CONTROL_CODE_RULES
+    + "Output only the decorated lines, nothing else."
+)
+
+# Appended to the dialogue prompt when decoration happens in the same call
+_INLINE_CONTROL_CODES = (
+    "Decorate each line with in-game control codes to make delivery lively.\n"
+    + _CONTROL_CODE_RULES.rstrip("\n")
+)
+
+
 def _format_control_code_decorator_prompt(raw_lines: str) -> str:
     """Builds a prompt for a second LLM to add safe control codes to the lines.
 
@@ -599,38 +845,8 @@ def _format_control_code_decorator_prompt(raw_lines: str) -> str:
 
     IMPORTANT: Maintain original wording; only insert control codes. One line in, one line out.
     """
-    guidelines = (
-        "You are a dialogue formatter for Animal Crossing (GameCube).\n"
-        "Decorate each line with in-game control codes to make delivery lively, but keep wording unchanged.\n"
-        "Match input line count exactly. Do not merge or split lines.\n"
-        "Always ensure each line starts with <Press A> exactly once (if it's already there, keep it, don't duplicate).\n"
-        "Use only this safe subset of control codes and syntax (hex uppercase, no spaces inside brackets):\n"
-        "- <Press A>\n"
-        "- <Clear Text>\n"
-        "- <Player Name>\n"
-        "- <Catchphrase>\n"
-        "- <Pause [SS]> (short beats like 05,0A,10,18)\n"
-        "- <Color Line [RRGGBB]> (line tint; prefer dark/muted colors)\n"
-        "- <Color [RRGGBB] for [NN] chars> (brief color accents on a word) (Only use dark colors)\n"
-        "- <Instant Skip> (for quick throwaway asides)\n"
-        "- <Unskippable> (sparingly, for emphasis)\n"
-        "- <Line Type [XX]> (00 normal, 01 excited, etc.)\n"
-        "- <Char Size [XXXX]> (e.g., 0030 small, 0040 normal, 0048 big)\n"
-        "- <Line Size [XXXX]> (wrap width hint, e.g., 001E)\n"
-        "- <Play Sound Effect [NN]> (00 bell, 01 happy, 02 very happy, 05 annoyed, 06 thunder)\n"
-        "- <NPC Expression [CC] [EEEE]> (facial emotion; examples: [00] [000A] happy, [00] [0005] angry, [00] [0002] shocked, [00] [000D] sad, [00] [0015] smile)\n"
-        "Keep visible length around 25 characters per line. THIS IS EXTREMELY IMPORTANT; use <Pause> instead of extra words.\n"
-        "Include either an <NPC Expression> and a <Play Sound Effect> together at least once.\n"
-        "Map moods to sounds: happy→01/02, angry→05, dramatic reveal→06, transactional/chime→00. Vary choices across lines.\n"
-        "Emphasize important words with color when appropriate.\n"
-        "Use <Pause [SS]> throughout the dialogue to make the dialogue more natural and engaging. THIS IS EXTREMELY IMPORTANT.\n"
-        "Use <NPC Expression> and <Play Sound Effect> THROUGHOUT this entire dialogue. THIS IS EXTREMELY IMPORTANT.\n"
-        "Prefer one or two effects per line. Avoid stacking too many on the same span.\n"
-        "If you add <NPC Expression>, place it early (right after <Press A>) and use at most one per line.\n"
-        "Never emit closing tags like </Color>; only use the self-contained forms above.\n"
-        "Output only the decorated lines, nothing else."
-    )
-    return f"Input lines (verbatim):\n{raw_lines}\n\nInstructions:\n{guidelines}\n\nNow return the decorated lines in order:"
+    # Static guidelines first so every decorator call shares the same prompt prefix
+    return f"Instructions:\n{_DECORATOR_GUIDELINES}\n\nInput lines (verbatim):\n{raw_lines}\n\nNow return the decorated lines in order:"
 
 
 def get_decorator_model() -> Optional[str]:
@@ -650,7 +866,7 @@ def decorate_dialogue_with_control_codes(
 ) -> str:
     """Runs a second LLM pass to insert safe control codes.
 
-    Expects a newline-separated set of lines.
+    Expects a newline-separated set of lines. The pass never sends images.
     """
     # Normalize multiple blank lines to single blanks to keep counts stable
     # but preserve blank lines as lines (LLM must return same count).
@@ -660,10 +876,58 @@ def decorate_dialogue_with_control_codes(
 
     prompt = _format_control_code_decorator_prompt(raw_lines)
     decorator_model = model or get_decorator_model()
-    result = call_llm(prompt=prompt, model=decorator_model, temperature=temperature)
+    # Text-only on purpose: decoration only rewrites the lines, so any screenshot
+    # stays with the base call instead of being uploaded (and billed) twice.
+    # Should a later pass need it, encode_image is memoized and won't re-read the file.
+    result = call_llm(prompt=prompt, model=decorator_model, temperature=temperature, cache_key="decorator")
     return result
 
 
+# GENERATION_COOLDOWN_SECONDS spaces out the start of LLM generations. It is
+# enforced before the next generation instead of by sleeping after this one,
+# so a finished result is returned (and shown in game) right away.
+_next_generation_at = 0.0
+_GENERATION_LOCK = threading.Lock()
+
+
+def _wait_for_cooldown() -> None:
+    """Reserves the next generation slot, sleeping only if it is still in the future."""
+    global _next_generation_at
+    with _GENERATION_LOCK:
+        now = time.monotonic()
+        start = max(now, _next_generation_at)
+        _next_generation_at = start + max(0.0, _COOLDOWN_S)
+    # Sleep outside the lock; concurrent callers have already been queued behind this slot
+    if start > now:
+        time.sleep(start - now)
+
+
+# Sampling at higher temperatures is meant to vary; only near-deterministic
+# generations are served from the response cache. Set DIALOGUE_TEMPERATURE at
+# or below the threshold to have repeated in-game requests answered locally.
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.3
+DIALOGUE_TEMPERATURE = float(os.environ.get("DIALOGUE_TEMPERATURE", "1.0"))
+
+
+def _response_cache_key(
+    prompt: str,
+    model: Optional[str],
+    temperature: float,
+    image_paths: Optional[List[str]],
+    decorate: bool,
+    decorator_model: Optional[str],
+) -> Optional[str]:
+    """Returns the response cache key for a generation, or None if it must not be cached.
+
+    The prompt embeds the villager data, gossip topic, time and headlines, so a
+    changed input is a new key. Screenshots aren't part of the prompt, so those
+    calls are never cached.
+    """
+    if temperature > RESPONSE_CACHE_MAX_TEMPERATURE or image_paths:
+        return None
+    return response_cache.make_key(prompt, model, str(temperature), "decorate" if decorate else None, decorator_model)
+
+
 def generate_dialogue(
     speaker: str,
     villagers_path: str = "villagers.json",
@@ -681,6 +945,7 @@ def generate_dialogue(
     news_count: int = 5,
     image_paths: Optional[List[str]] = None,
     gossip_context: Optional[Dict[str, Any]] = None,
+    temperature: float = DIALOGUE_TEMPERATURE,
 ) -> str:
     villagers = load_villagers(villagers_path)
     prompt = format_dialogue_prompt(
@@ -696,19 +961,31 @@ def generate_dialogue(
         news_count=news_count,
         screenshot_attached=bool(image_paths),
         gossip_context=gossip_context,
+        inline_control_codes=decorate and not _TWO_PASS,
     )
     if dry_run:
         return prompt
-    base = call_llm(prompt=prompt, model=model, image_paths=image_paths)
+
+    cache_key = _response_cache_key(prompt, model, temperature, image_paths, decorate, decorator_model)
+    if cache_key is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # The prompt (and its headline fetch) is built while any cooldown runs
+    _wait_for_cooldown()
+    base = call_llm(prompt=prompt, model=model, temperature=temperature, image_paths=image_paths, cache_key=speaker)
     if not decorate:
         result = base
+    elif not _TWO_PASS:
+        # The prompt already asked for control codes; no second round-trip
+        result = base + "\n<End Conversation>"
     else:
         decorated = decorate_dialogue_with_control_codes(base, model=decorator_model)
         result = decorated + "\n<End Conversation>"
 
-    cooldown_s = float(os.environ.get("GENERATION_COOLDOWN_SECONDS", "10"))
-    if cooldown_s > 0:
-        time.sleep(cooldown_s)
+    if cache_key is not None:
+        response_cache.put(cache_key, result)
     return result
 
 
@@ -729,6 +1006,7 @@ def generate_spotlight_dialogue(
     news_count: int = 5,
     image_paths: Optional[List[str]] = None,
     gossip_context: Optional[Dict[str, Any]] = None,
+    temperature: float = DIALOGUE_TEMPERATURE,
 ) -> str:
     villagers = load_villagers(villagers_path)
     prompt = format_spotlight_prompt(
@@ -744,11 +1022,21 @@ def generate_spotlight_dialogue(
         news_count=news_count,
         screenshot_attached=bool(image_paths),
         gossip_context=gossip_context,
+        inline_control_codes=decorate and not _TWO_PASS,
     )
     if dry_run:
         return prompt
-    base = call_llm(prompt=prompt, model=model, image_paths=image_paths)
-    if not decorate:
+
+    cache_key = _response_cache_key(prompt, model, temperature, image_paths, decorate, decorator_model)
+    if cache_key is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # The prompt (and its headline fetch) is built while any cooldown runs
+    _wait_for_cooldown()
+    base = call_llm(prompt=prompt, model=model, temperature=temperature, image_paths=image_paths, cache_key=speaker)
+    if not decorate or not _TWO_PASS:
         # Ensure manual control code at end
         result = base.rstrip() + LOAD_GAME_CODE
     else:
@@ -756,9 +1044,8 @@ def generate_spotlight_dialogue(
         # Manually append the required control code (do not rely on LLM)
         result = decorated.rstrip() + LOAD_GAME_CODE
 
-    cooldown_s = float(os.environ.get("GENERATION_COOLDOWN_SECONDS", "10"))
-    if cooldown_s > 0:
-        time.sleep(cooldown_s)
+    if cache_key is not None:
+        response_cache.put(cache_key, result)
     return result
 
 
@@ -773,11 +1060,12 @@ def main() -> None:
     parser.add_argument("--decorator-model", default=None, help="LLM model for control-code decoration (default GOOGLE_MODEL_DECORATOR or GOOGLE_MODEL)")
     parser.add_argument("--dry-run", action="store_true", help="Print the prompt instead of calling the LLM")
     parser.add_argument("--no-time-context", action="store_true", help="Disable inclusion of date/time context")
-    parser.add_argument("--no-decorate", action="store_true", help="Skip the second LLM decoration pass")
+    parser.add_argument("--no-decorate", action="store_true", help="Skip control-code decoration (the second pass, or inline with DIALOGUE_SINGLE_PASS=1)")
     parser.add_argument("--datetime", default=None, help="ISO datetime override for time context (e.g., 2025-08-16T14:30:00)")
     parser.add_argument("--no-news", action="store_true", help="Disable inclusion of recent headlines context")
     parser.add_argument("--news-feed", default=NEWS_FEED_DEFAULT, help="RSS/Atom feed URL for latest headlines context")
     parser.add_argument("--news-count", type=int, default=5, help="Number of headlines to include (default 5)")
+    parser.add_argument("--temperature", type=float, default=DIALOGUE_TEMPERATURE, help=f"Sampling temperature (default DIALOGUE_TEMPERATURE); at or below {RESPONSE_CACHE_MAX_TEMPERATURE} responses are cached")
     args = parser.parse_args()
 
     output = generate_dialogue(
@@ -795,6 +1083,7 @@ def main() -> None:
         include_news_context=not args.no_news,
         news_feed_url=args.news_feed,
         news_count=args.news_count,
+        temperature=args.temperature,
     )
     print(output)
 
@@ -1,16 +1,17 @@
 """
 A corrected and optimized script to efficiently search game memory
-for text, with a progress indicator and bug fixes.
+for text, reading each range in one call and scanning it with bytes.find.
 """
 
 import memory_ipc
-import sys
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple
 
 TARGET_TEXT = "Lobo"
 
-CHUNK_SIZE = 512 * 1024  # Read 512 KB of memory at a time
-OVERLAP = 128            # Overlap chunks to find text that spans across them
+FALLBACK_CHUNK_SIZE = 512 * 1024  # Piece size if a range can't be read in one call
+
+# Maps every byte to itself if printable ASCII, else to '.'
+_PRINTABLE_TABLE = bytes(b if 32 <= b <= 126 else ord(".") for b in range(256))
 
 def get_main_ram_range() -> List[Tuple[int, int, str]]:
     """Returns the primary memory range to scan (24 MB of MEM1 for GameCube)."""
@@ -20,15 +21,35 @@ def get_context(data: bytes, pos: int, length: int, radius: int = 40) -> str:
     """Extracts a readable string of context around a found byte sequence."""
     start = max(0, pos - radius)
     end = min(len(data), pos + length + radius)
-    chunk = data[start:end]
-    readable_str = "".join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-    highlight_start = pos - start
-    highlight_end = highlight_start + length
-    return (
-        readable_str[:highlight_start]
-        + f"[{readable_str[highlight_start:highlight_end]}]"
-        + readable_str[highlight_end:]
-    )
+    readable = data[start:end].translate(_PRINTABLE_TABLE).decode("ascii")
+    h = pos - start
+    return f"{readable[:h]}[{readable[h:h + length]}]{readable[h + length:]}"
+
+def read_range(start_addr: int, size: int) -> Optional[bytearray]:
+    """Reads a whole range into one buffer, in a single call when possible, else piece by piece."""
+    buf = bytearray(size)
+    try:
+        read = memory_ipc.read_into(start_addr, buf)
+    except Exception:
+        read = 0
+    if read == size:
+        return buf
+
+    # Fill the same buffer through zero-copy slices instead of joining pieces;
+    # an unreadable piece is zero-filled so the rest of the range is still scanned
+    view = memoryview(buf)
+    any_read = False
+    for offset in range(0, size, FALLBACK_CHUNK_SIZE):
+        piece = min(FALLBACK_CHUNK_SIZE, size - offset)
+        try:
+            read = memory_ipc.read_into(start_addr + offset, view[offset:offset + piece])
+        except Exception:
+            read = 0
+        if read == piece:
+            any_read = True
+        else:
+            view[offset:offset + piece] = bytes(piece)
+    return buf if any_read else None
 
 def search_for_text(target: str):
     """Connects and efficiently searches main RAM for the target text."""
@@ -43,46 +64,29 @@ def search_for_text(target: str):
         print(f"❌ Error: Target text '{target}' contains non-ASCII characters.")
         return
 
-    # Use a set to automatically handle duplicate finds in overlapping regions
-    found_locations: Set[Tuple[int, str]] = set()
-    
+    found_locations: List[Tuple[int, str]] = []
+
     for start_addr, size, label in get_main_ram_range():
         print(f"Scanning {label} from 0x{start_addr:08X} to 0x{start_addr + size:08X}...")
-        
-        step_size = CHUNK_SIZE - OVERLAP
-        cursor = start_addr
-        end_addr = start_addr + size
-
-        # --- CORRECTED SCANNING LOOP ---
-        while cursor < end_addr:
-            progress = (cursor - start_addr) / size * 100
-            sys.stdout.write(f"\rProgress: {progress:.1f}%")
-            sys.stdout.flush()
-
-            # Read a full chunk. The memory reader should handle reads near the end.
-            data = memory_ipc.read_memory(cursor, CHUNK_SIZE)
-
-            if data:
-                pos = data.find(needle)
-                while pos != -1:
-                    address = cursor + pos
-                    # Ensure the found address is within our target range
-                    if address < end_addr:
-                        context = get_context(data, pos, len(needle))
-                        found_locations.add((address, context))
-                    pos = data.find(needle, pos + 1)
-            
-            # Always advance the cursor by the fixed step size to prevent getting stuck
-            cursor += step_size
-
-        sys.stdout.write("\rProgress: 100.0%\n")
-        sys.stdout.flush()
+
+        # One read of the whole range instead of hundreds of overlapping chunk
+        # round-trips; 24 MB fits comfortably in memory.
+        data = read_range(start_addr, size)
+        if not data:
+            print(f"❌ Could not read {label}.")
+            continue
+
+        # bytes.find scans in C; restarting one byte past each hit also reports
+        # overlapping matches of self-overlapping needles like "aa"
+        pos = data.find(needle)
+        while pos != -1:
+            found_locations.append((start_addr + pos, get_context(data, pos, len(needle))))
+            pos = data.find(needle, pos + 1)
 
     if found_locations:
-        # Sort results by address for clean output
-        sorted_locations = sorted(list(found_locations))
-        print(f"\n🎉 Found {len(sorted_locations)} match(es) for '{target}':")
-        for addr, context in sorted_locations:
+        # A single forward scan per range already yields matches in address order
+        print(f"\n🎉 Found {len(found_locations)} match(es) for '{target}':")
+        for addr, context in found_locations:
             print(f"  - Address: 0x{addr:08X} | Context: ...{context}...")
     else:
         print(f"\n🤷 No matches found for '{target}'.")
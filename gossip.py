@@ -1,8 +1,11 @@
+import atexit
+import bisect
 import json
 import os
 import random
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 
 DEFAULT_STATE_PATH = os.environ.get("GOSSIP_STATE_PATH", os.path.join(os.getcwd(), "gossip_state.json"))
@@ -10,6 +13,18 @@ RUMOR_TOPIC = os.environ.get(
     "GOSSIP_TOPIC",
     "Tom Nook's loan terms are exploitative and the town's economy is unfair.",
 )
+# Changes are appended to a small log next to the snapshot; the snapshot is
+# rewritten (and the log cleared) once the log reaches this many lines, and at exit.
+LOG_COMPACT_LINES = int(os.environ.get("GOSSIP_LOG_COMPACT_LINES", "256"))
+
+# Parsed state per path, shared by every call instead of re-reading the file.
+# _MTIME remembers the snapshot version each entry came from so outside edits
+# are picked up; dirty entries (with pending log lines) are kept as they are.
+_STATE_CACHE: Dict[str, Dict] = {}
+_MTIME: Dict[str, Optional[int]] = {}
+_DIRTY: Set[str] = set()
+_LOG_LINES: Dict[str, int] = {}
+_LOCK = threading.RLock()
 
 
 def _now_ts() -> float:
@@ -20,34 +35,123 @@ def _clamp(value: int, lo: int = 0, hi: int = 100) -> int:
     return max(lo, min(hi, value))
 
 
-def load_state(villager_names: Optional[List[str]] = None, path: str = DEFAULT_STATE_PATH) -> Dict:
-    state: Dict = {
-        "rumor_topic": RUMOR_TOPIC,
-        "villager_rumor_level": {},
-        "global_rumor_level": 0,
-        "last_updated": _now_ts(),
-    }
+def _disk_mtime(path: str) -> Optional[int]:
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                disk = json.load(f)
-                if isinstance(disk, dict):
-                    state.update(disk)
-    except Exception:
-        pass
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-    if villager_names:
-        for name in villager_names:
-            state["villager_rumor_level"].setdefault(name, 0)
-    return state
 
+def _log_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".log"
 
-def save_state(state: Dict, path: str = DEFAULT_STATE_PATH) -> None:
+
+def _replay_log(state: Dict, path: str) -> int:
+    """Applies logged changes newer than the snapshot to state; returns the line count."""
+    count = 0
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
-    except Exception:
+        with open(_log_path(path), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+                count += 1
+                # Entries hold resulting levels, so replaying one twice is harmless
+                state["villager_rumor_level"].update(entry.get("v", {}))
+                state["global_rumor_level"] = entry.get("g", state.get("global_rumor_level", 0))
+                state["last_updated"] = entry.get("t", state.get("last_updated"))
+    except OSError:
         pass
+    return count
+
+
+def load_state(villager_names: Optional[List[str]] = None, path: str = DEFAULT_STATE_PATH) -> Dict:
+    """Returns the gossip state for path; the dict is cached and shared between calls."""
+    with _LOCK:
+        state = _STATE_CACHE.get(path)
+        mtime = _disk_mtime(path)
+        if state is None or (path not in _DIRTY and mtime != _MTIME.get(path)):
+            state = {
+                "rumor_topic": RUMOR_TOPIC,
+                "villager_rumor_level": {},
+                "global_rumor_level": 0,
+                "last_updated": _now_ts(),
+            }
+            try:
+                if mtime is not None:
+                    with open(path, "r", encoding="utf-8") as f:
+                        disk = json.load(f)
+                        if isinstance(disk, dict):
+                            state.update(disk)
+            except Exception:
+                pass
+            _LOG_LINES[path] = _replay_log(state, path)
+            if _LOG_LINES[path]:
+                _DIRTY.add(path)
+            _STATE_CACHE[path] = state
+            _MTIME[path] = mtime
+
+        if villager_names:
+            for name in villager_names:
+                state["villager_rumor_level"].setdefault(name, 0)
+        return state
+
+
+def save_state(state: Dict, path: str = DEFAULT_STATE_PATH) -> None:
+    """Writes a full snapshot of state and clears the change log."""
+    with _LOCK:
+        _STATE_CACHE[path] = state
+        _DIRTY.add(path)
+        flush_state(path, force=True)
+
+
+def _log_change(state: Dict, names: List[str], path: str = DEFAULT_STATE_PATH) -> None:
+    """Records the new levels of names (plus the global level) as one log line."""
+    levels = state["villager_rumor_level"]
+    entry = {
+        "t": state["last_updated"],
+        "g": state["global_rumor_level"],
+        "v": {name: levels[name] for name in names},
+    }
+    with _LOCK:
+        _STATE_CACHE[path] = state
+        _DIRTY.add(path)
+        try:
+            with open(_log_path(path), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            _LOG_LINES[path] = _LOG_LINES.get(path, 0) + 1
+        except Exception:
+            pass
+        flush_state(path)
+
+
+def flush_state(path: Optional[str] = None, force: bool = False) -> None:
+    """Compacts dirty state into its snapshot (all paths when path is None).
+
+    Without force, a path is only compacted once its log reaches LOG_COMPACT_LINES.
+    """
+    with _LOCK:
+        paths = [path] if path is not None else list(_DIRTY)
+        for p in paths:
+            if p not in _DIRTY:
+                continue
+            if not force and _LOG_LINES.get(p, 0) < LOG_COMPACT_LINES:
+                continue
+            try:
+                with open(p, "w", encoding="utf-8") as f:
+                    json.dump(_STATE_CACHE[p], f, ensure_ascii=False, separators=(",", ":"))
+                _MTIME[p] = _disk_mtime(p)
+                # Only clear the log once the snapshot holds its changes
+                open(_log_path(p), "w").close()
+            except Exception:
+                pass
+            # Drop the flag even on failure, matching the old best-effort save
+            _DIRTY.discard(p)
+            _LOG_LINES[p] = 0
+
+
+atexit.register(flush_state, force=True)
 
 
 def seed_if_needed(villager_names: List[str], force: bool = False) -> None:
@@ -58,57 +162,63 @@ def seed_if_needed(villager_names: List[str], force: bool = False) -> None:
     allow = os.environ.get("GOSSIP_SEED", "1") == "1"
     if not (allow or force):
         return
-    state = load_state(villager_names)
-    if state.get("global_rumor_level", 0) > 0 and not force:
-        return
-    state["global_rumor_level"] = 10
-    for name in random.sample(villager_names, min(3, len(villager_names))):
-        state["villager_rumor_level"][name] = 20
-    state["last_updated"] = _now_ts()
-    save_state(state)
+    with _LOCK:
+        state = load_state(villager_names)
+        if state.get("global_rumor_level", 0) > 0 and not force:
+            return
+        state["global_rumor_level"] = 10
+        seeded = random.sample(villager_names, min(3, len(villager_names)))
+        for name in seeded:
+            state["villager_rumor_level"][name] = 20
+        state["last_updated"] = _now_ts()
+        _log_change(state, seeded)
 
 
 def observe_interaction(speaker: Optional[str], amount: int = 7, villager_names: Optional[List[str]] = None) -> None:
     """When a villager speaks, increase their exposure to the rumor."""
     if not speaker:
         return
-    state = load_state(villager_names)
-    levels = state.setdefault("villager_rumor_level", {})
-    levels[speaker] = _clamp(levels.get(speaker, 0) + amount)
-    # Nudge global level slightly
-    state["global_rumor_level"] = _clamp(state.get("global_rumor_level", 0) + 1)
-    state["last_updated"] = _now_ts()
-    save_state(state)
+    with _LOCK:
+        state = load_state(villager_names)
+        levels = state.setdefault("villager_rumor_level", {})
+        levels[speaker] = _clamp(levels.get(speaker, 0) + amount)
+        # Nudge global level slightly
+        state["global_rumor_level"] = _clamp(state.get("global_rumor_level", 0) + 1)
+        state["last_updated"] = _now_ts()
+        _log_change(state, [speaker])
 
 
 def spread(villager_names: List[str], tick: int = 1) -> None:
     """Slowly spread rumor to random villagers; accelerate with higher global level."""
     if not villager_names:
         return
-    state = load_state(villager_names)
-    levels: Dict[str, int] = state.setdefault("villager_rumor_level", {})
-    global_level = state.get("global_rumor_level", 0)
+    with _LOCK:
+        state = load_state(villager_names)
+        levels: Dict[str, int] = state.setdefault("villager_rumor_level", {})
+        global_level = state.get("global_rumor_level", 0)
 
-    # Number of contacts per tick scales with global level
-    contacts = max(1, global_level // 20)
-    for _ in range(contacts):
-        name = random.choice(villager_names)
+        # Number of contacts per tick scales with global level
+        contacts = max(1, global_level // 20)
         bump = 1 + (global_level // 33)
-        levels[name] = _clamp(levels.get(name, 0) + bump)
+        touched: List[str] = []
+        for _ in range(contacts):
+            name = random.choice(villager_names)
+            levels[name] = _clamp(levels.get(name, 0) + bump)
+            touched.append(name)
+
+        # Gentle natural rise of global level
+        state["global_rumor_level"] = _clamp(global_level + tick)
+        state["last_updated"] = _now_ts()
+        _log_change(state, touched)
+
 
-    # Gentle natural rise of global level
-    state["global_rumor_level"] = _clamp(global_level + tick)
-    state["last_updated"] = _now_ts()
-    save_state(state)
+# Lowest level of stages 1..5; anything below 10 is stage 0
+_STAGE_EDGES = (10, 25, 45, 70, 90)
 
 
 def _stage_for(level: int) -> int:
-    # Map 0..100 to stages 0..5
-    bins = [0, 10, 25, 45, 70, 90, 101]
-    for i in range(len(bins) - 1):
-        if bins[i] <= level < bins[i + 1]:
-            return i
-    return 5
+    # Map 0..100 to stages 0..5 with a C-level binary search
+    return bisect.bisect_right(_STAGE_EDGES, level)
 
 
 def get_context_for(speaker: Optional[str], villager_names: Optional[List[str]] = None) -> Dict[str, object]:
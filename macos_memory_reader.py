@@ -9,9 +9,40 @@ import ctypes.util
 import os
 import struct
 import sys
-from typing import Optional, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Tuple, Union
 import psutil
 
+# Big-endian GameCube scalars, format strings parsed once
+_U32 = struct.Struct('>I')
+_F32 = struct.Struct('>f')
+_F64 = struct.Struct('>d')
+
+
+class VMRegionSubmapInfo64(ctypes.Structure):
+    """vm_region_submap_info_64 up to user_wired_count (VM_REGION_SUBMAP_INFO_V0_COUNT_64)."""
+    _pack_ = 4
+    _fields_ = [
+        ("protection", ctypes.c_int),
+        ("max_protection", ctypes.c_int),
+        ("inheritance", ctypes.c_uint32),
+        ("offset", ctypes.c_uint64),
+        ("user_tag", ctypes.c_uint32),
+        ("pages_resident", ctypes.c_uint32),
+        ("pages_shared_now_private", ctypes.c_uint32),
+        ("pages_swapped_out", ctypes.c_uint32),
+        ("pages_dirtied", ctypes.c_uint32),
+        ("ref_count", ctypes.c_uint32),
+        ("shadow_depth", ctypes.c_uint16),
+        ("external_pager", ctypes.c_uint8),
+        ("share_mode", ctypes.c_uint8),
+        ("is_submap", ctypes.c_int),
+        ("behavior", ctypes.c_int),
+        ("object_id", ctypes.c_uint32),
+        ("user_wired_count", ctypes.c_uint16),
+    ]
+
 
 class MacOSMemoryReader:
     """Direct memory reader for macOS processes using mach system calls."""
@@ -68,6 +99,16 @@ class MacOSMemoryReader:
         ]
         self.libsystem.vm_read.restype = self.kern_return_t
         
+        # mach_vm_read_overwrite (copies into a caller-owned buffer, nothing to deallocate)
+        self.libsystem.mach_vm_read_overwrite.argtypes = [
+            self.mach_port_t,  # target_task
+            self.vm_address_t,  # address
+            self.vm_size_t,     # size
+            self.vm_address_t,  # data
+            ctypes.POINTER(self.vm_size_t)  # outsize
+        ]
+        self.libsystem.mach_vm_read_overwrite.restype = self.kern_return_t
+        
         # vm_write
         self.libsystem.vm_write.argtypes = [
             self.mach_port_t,  # target_task
@@ -96,6 +137,17 @@ class MacOSMemoryReader:
             ctypes.POINTER(self.mach_port_t)  # object_name
         ]
         self.libsystem.vm_region_64.restype = self.kern_return_t
+        
+        # mach_vm_region_recurse
+        self.libsystem.mach_vm_region_recurse.argtypes = [
+            self.mach_port_t,  # target_task
+            ctypes.POINTER(self.vm_address_t),  # address
+            ctypes.POINTER(self.vm_size_t),     # size
+            ctypes.POINTER(self.natural_t),     # nesting_depth
+            ctypes.c_void_p,    # info
+            ctypes.POINTER(self.mach_msg_type_number_t)  # infoCnt
+        ]
+        self.libsystem.mach_vm_region_recurse.restype = self.kern_return_t
     
     def find_dolphin_process(self) -> Optional[int]:
         """Find the running Dolphin process."""
@@ -184,6 +236,35 @@ class MacOSMemoryReader:
             print(f"❌ Exception reading memory: {e}")
             return None
     
+    def read_into(self, address: int, buf: Union[bytearray, memoryview], size: Optional[int] = None) -> int:
+        """Read size bytes (default len(buf)) into the start of buf; returns bytes read, 0 on failure."""
+        if not self.is_connected:
+            print("❌ Not connected to process")
+            return 0
+        
+        size = len(buf) if size is None else min(size, len(buf))
+        try:
+            target = (ctypes.c_char * len(buf)).from_buffer(buf)
+            out_size = self.vm_size_t()
+            result = self.libsystem.mach_vm_read_overwrite(
+                self.task,
+                address,
+                size,
+                ctypes.addressof(target),
+                ctypes.byref(out_size)
+            )
+            
+            if result != self.KERN_SUCCESS:
+                print(f"❌ Failed to read memory at 0x{address:08X}")
+                print(f"   Error code: {result}")
+                return 0
+            
+            return out_size.value
+            
+        except Exception as e:
+            print(f"❌ Exception reading memory: {e}")
+            return 0
+    
     def write_memory(self, address: int, data: bytes) -> bool:
         """Write memory to the connected process."""
         if not self.is_connected:
@@ -224,66 +305,137 @@ class MacOSMemoryReader:
         """Read a 32-bit word from memory (big-endian for GameCube/Wii)."""
         data = self.read_memory(address, 4)
         if data and len(data) == 4:
-            return struct.unpack('>I', data)[0]  # Big-endian unsigned int
+            return _U32.unpack(data)[0]  # Big-endian unsigned int
         return None
     
     def read_float(self, address: int) -> Optional[float]:
         """Read a 32-bit float from memory (big-endian for GameCube/Wii)."""
         data = self.read_memory(address, 4)
         if data and len(data) == 4:
-            return struct.unpack('>f', data)[0]  # Big-endian float
+            return _F32.unpack(data)[0]  # Big-endian float
         return None
     
     def read_double(self, address: int) -> Optional[float]:
         """Read a 64-bit double from memory (big-endian for GameCube/Wii)."""
         data = self.read_memory(address, 8)
         if data and len(data) == 8:
-            return struct.unpack('>d', data)[0]  # Big-endian double
+            return _F64.unpack(data)[0]  # Big-endian double
         return None
     
-    def search_memory_pattern(self, pattern: bytes, start_addr: int = 0x80000000, end_addr: int = 0x81800000) -> List[int]:
+    def search_memory_pattern(self, pattern: bytes, start_addr: int = 0x80000000, end_addr: int = 0x81800000, workers: int = 4) -> List[int]:
         """Search for a byte pattern in memory."""
         if not self.is_connected:
             return []
         
-        matches = []
         chunk_size = 0x10000  # 64KB chunks
         
         print(f"🔍 Searching for pattern {pattern.hex()} in range 0x{start_addr:08X}-0x{end_addr:08X}")
         
-        current_addr = start_addr
-        while current_addr < end_addr:
-            chunk_data = self.read_memory(current_addr, min(chunk_size, end_addr - current_addr))
-            if chunk_data:
+        # One buffer per worker thread, reused for every chunk it reads
+        local = threading.local()
+        
+        def scan_chunk(chunk_addr: int) -> List[int]:
+            chunk_buf = getattr(local, "buf", None)
+            if chunk_buf is None:
+                chunk_buf = local.buf = bytearray(chunk_size)
+            found = []
+            read = self.read_into(chunk_addr, chunk_buf, min(chunk_size, end_addr - chunk_addr))
+            if read:
                 offset = 0
                 while True:
-                    pos = chunk_data.find(pattern, offset)
+                    pos = chunk_buf.find(pattern, offset, read)
                     if pos == -1:
                         break
-                    matches.append(current_addr + pos)
+                    found.append(chunk_addr + pos)
                     offset = pos + 1
-            
-            current_addr += chunk_size
+            return found
+        
+        # The mach read runs without the GIL, so reads overlap with other
+        # threads' finds; map() keeps results in address order.
+        matches = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for found in pool.map(scan_chunk, range(start_addr, end_addr, chunk_size)):
+                matches.extend(found)
         
         return matches
     
-    def get_memory_regions(self) -> List[Tuple[int, int, str]]:
-        """Get list of memory regions in the target process using vmmap approach."""
+    def get_memory_regions(self, *, min_size: int = 0, writable_only: bool = False) -> List[Tuple[int, int, str]]:
+        """Get list of memory regions in the target process.
+        
+        Walks the task's address space in-process; falls back to parsing vmmap
+        output only if the walk itself fails. min_size / writable_only drop
+        regions smaller than min_size or without write access.
+        """
         if not self.is_connected:
             return []
         
-        # Use subprocess to call vmmap as it's more reliable
+        regions = self._walk_memory_regions(min_size, writable_only)
+        if regions is not None:
+            # May be empty when no region passes the filters; vmmap wouldn't find more
+            return regions
+        
         import subprocess
         try:
             result = subprocess.run(['vmmap', str(self.pid)], 
                                   capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
-                return self._parse_vmmap_output(result.stdout)
+                return [
+                    r for r in self._parse_vmmap_output(result.stdout)
+                    if r[1] >= min_size and (not writable_only or 'w' in r[2])
+                ]
         except Exception as e:
             print(f"Warning: Could not run vmmap: {e}")
         
         return []
     
+    def _walk_memory_regions(self, min_size: int = 0, writable_only: bool = False) -> Optional[List[Tuple[int, int, str]]]:
+        """List top-level regions with mach_vm_region_recurse, no subprocess needed.
+        
+        Returns None if the walk fails (the first call errors or an exception is
+        raised), as opposed to an empty list when no region matched.
+        """
+        regions = []
+        walked = False
+        address = self.vm_address_t(0)
+        info_count = ctypes.sizeof(VMRegionSubmapInfo64) // ctypes.sizeof(self.natural_t)
+        try:
+            while True:
+                size = self.vm_size_t(0)
+                depth = self.natural_t(0)
+                info = VMRegionSubmapInfo64()
+                count = self.mach_msg_type_number_t(info_count)
+                result = self.libsystem.mach_vm_region_recurse(
+                    self.task,
+                    ctypes.byref(address),
+                    ctypes.byref(size),
+                    ctypes.byref(depth),
+                    ctypes.byref(info),
+                    ctypes.byref(count)
+                )
+                if result != self.KERN_SUCCESS:
+                    if not walked:
+                        return None
+                    break  # KERN_INVALID_ADDRESS once past the last region
+                walked = True
+                
+                prot = info.protection
+                if size.value < min_size or (writable_only and not prot & self.VM_PROT_WRITE):
+                    address.value += size.value
+                    continue
+                # Same shape as vmmap's current protection, e.g. "rw-"
+                prot_str = (
+                    ('r' if prot & self.VM_PROT_READ else '-')
+                    + ('w' if prot & self.VM_PROT_WRITE else '-')
+                    + ('x' if prot & self.VM_PROT_EXECUTE else '-')
+                )
+                regions.append((address.value, size.value, prot_str))
+                address.value += size.value
+        except Exception as e:
+            print(f"Warning: Could not walk memory regions: {e}")
+            return None
+        
+        return regions
+    
     def _parse_vmmap_output(self, vmmap_output: str) -> List[Tuple[int, int, str]]:
         """Parse vmmap output to extract memory regions."""
         regions = []
@@ -4,10 +4,14 @@ Simple Memory IPC Interface for Dolphin GameCube Memory
 Direct read/write functions for specific memory blocks.
 """
 
+import argparse
+import contextlib
+import json
+import os
 import struct
 import time
 import sys  # Added: To check the operating system
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
 # --- MODIFIED: Platform-specific imports ---
 # This code now dynamically chooses the correct reader based on the OS.
@@ -20,10 +24,32 @@ elif sys.platform == 'win32':
 
 # -------------------------------------------
 
+# GameCube main memory (MEM1): 0x80000000-0x81800000 maps to base+offset
+GC_MEM1_START = 0x80000000
+GC_MEM1_END = 0x81800000
+
+# Remembers where MEM1 was found for a given Dolphin PID so reconnects skip the
+# region scan. MEMORY_IPC_BASE_CACHE picks another file; set it empty to disable.
+BASE_CACHE_PATH = os.path.expanduser(os.environ.get("MEMORY_IPC_BASE_CACHE", "~/.ac_llm_mod_cache")) or None
+
+# read_many fetches blocks closer than this with one read and slices them apart
+READ_MANY_GAP = 4096
+
+# monitor_changes reports changes of larger blocks per page of this size
+MONITOR_PAGE_SIZE = 4096
+
+_U32 = struct.Struct('>I')
+_F32 = struct.Struct('>f')
+
+# Maps printable ASCII to itself and every other byte to '.'
+_PRINT_TBL = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
 
 class MemoryIPC:
     """Simple interface for reading/writing GameCube memory blocks."""
 
+    __slots__ = ('reader', 'connected', 'gamecube_base', '_gc_offset')
+
     def __init__(self):
         # --- MODIFIED: Select reader based on OS ---
         if sys.platform == 'darwin':
@@ -36,37 +62,86 @@ class MemoryIPC:
 
         self.connected = False
         self.gamecube_base = None
+        # gamecube_base - GC_MEM1_START, set while connected; None otherwise
+        self._gc_offset: Optional[int] = None
 
     def connect(self) -> bool:
         """Connect to Dolphin and find GameCube memory."""
         if not self.reader.connect_to_process():
             return False
 
+        # Same Dolphin process as last time: one probe read instead of a full scan
+        cached = self._load_cached_base()
+        if cached is not None and self._is_game_base(cached):
+            return self._set_base(cached)
+
         # Find the main GameCube memory region
-        regions = self.reader.get_memory_regions()
-        for addr, size, prot in regions:
-            if size >= 0x1800000 and ('rw' in prot or prot == 'READWRITE'):  # At least 24MB, handle win32 prot
-                # Check if this contains game data
-                test_data = self.reader.read_memory(addr, 16)
-                if test_data and b'GAFE' in test_data:  # Animal Crossing
-                    self.gamecube_base = addr
-                    self.connected = True
-                    print(f"✅ Connected! GameCube memory at 0x{addr:016X}")
-                    return True
+        # Both readers drop small and read-only regions during the walk
+        regions = self.reader.get_memory_regions(min_size=0x1800000, writable_only=True)
+        candidates = [
+            (addr, size) for addr, size, prot in regions
+            if size >= 0x1800000 and ('rw' in prot or prot == 'READWRITE')  # At least 24MB, handle win32 prot
+        ]
+        # MEM1 is 24MB, so the smallest qualifying regions are the likeliest hits
+        candidates.sort(key=lambda r: r[1])
+        for addr, size in candidates:
+            if self._is_game_base(addr):
+                self._save_cached_base(addr)
+                return self._set_base(addr)
 
         print("❌ Could not find GameCube memory")
         return False
 
-    def _gc_to_real_addr(self, gc_address: int) -> Optional[int]:
-        """Convert GameCube virtual address to real process address."""
-        if not self.connected or not self.gamecube_base:
+    def _is_game_base(self, addr: int) -> bool:
+        """Check if this contains game data."""
+        # read_into reports failure as 0; the macOS read_memory exits the process
+        # on a failed read, which a stale cache entry or odd region must not do
+        if hasattr(self.reader, "read_into"):
+            test_data = bytearray(16)
+            if self.reader.read_into(addr, test_data) != 16:
+                return False
+        else:
+            test_data = self.reader.read_memory(addr, 16)
+        return bool(test_data) and b'GAFE' in test_data  # Animal Crossing
+
+    def _set_base(self, addr: int) -> bool:
+        self.gamecube_base = addr
+        self._gc_offset = addr - GC_MEM1_START
+        self.connected = True
+        print(f"✅ Connected! GameCube memory at 0x{addr:016X}")
+        return True
+
+    def _load_cached_base(self) -> Optional[int]:
+        """Returns the cached MEM1 base if it was recorded for the current PID."""
+        if not BASE_CACHE_PATH:
+            return None
+        try:
+            with open(BASE_CACHE_PATH, 'r') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
             return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable base cache {BASE_CACHE_PATH}: {e}")
+            return None
+        if not isinstance(cache, dict) or cache.get('pid') != self.reader.pid:
+            return None
+        base = cache.get('base')
+        return base if isinstance(base, int) else None
 
-        # GameCube main memory: 0x80000000-0x81800000 maps to base+offset
-        if 0x80000000 <= gc_address < 0x81800000:
-            offset = gc_address - 0x80000000
-            return self.gamecube_base + offset
+    def _save_cached_base(self, addr: int) -> None:
+        if not BASE_CACHE_PATH:
+            return
+        try:
+            with open(BASE_CACHE_PATH, 'w') as f:
+                json.dump({'base': addr, 'pid': self.reader.pid}, f)
+        except OSError as e:
+            print(f"⚠️ Could not write base cache {BASE_CACHE_PATH}: {e}")
 
+    def _gc_to_real_addr(self, gc_address: int) -> Optional[int]:
+        """Convert GameCube virtual address to real process address."""
+        offset = self._gc_offset
+        if offset is not None and GC_MEM1_START <= gc_address < GC_MEM1_END:
+            return gc_address + offset
         return None
 
     def read_memory(self, gc_address: int, size: int) -> Optional[bytes]:
@@ -80,11 +155,81 @@ class MemoryIPC:
         Returns:
             bytes data or None if failed
         """
+        # Translation inlined: this is the per-read hot path for word/byte/float reads
+        offset = self._gc_offset
+        if offset is None or not (GC_MEM1_START <= gc_address < GC_MEM1_END):
+            return None
+
+        return self.reader.read_memory(gc_address + offset, size)
+
+    def read_many(self, blocks: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """
+        Read several (gc_address, size) blocks in one call.
+
+        Blocks within READ_MANY_GAP bytes of each other are coalesced into a
+        single read, so scattered fields in the same area cost one round-trip.
+
+        Returns:
+            One bytes (or None if that block failed) per block, in input order
+        """
+        results: List[Optional[bytes]] = [None] * len(blocks)
+        spans: List[List] = []  # [start, end, member indices]
+        for i in sorted(range(len(blocks)), key=lambda i: blocks[i][0]):
+            addr, size = blocks[i]
+            if size <= 0:
+                continue
+            if spans and addr <= spans[-1][1] + READ_MANY_GAP:
+                span = spans[-1]
+                span[1] = max(span[1], addr + size)
+                span[2].append(i)
+            else:
+                spans.append([addr, addr + size, [i]])
+
+        for start, end, members in spans:
+            data = None
+            if len(members) > 1:
+                # read_into reports a failed span as 0 instead of the macOS
+                # reader's read_memory exiting, so the fallback below can run
+                data = bytearray(end - start)
+                if self.read_into(start, data) != end - start:
+                    data = None
+            if data is not None:
+                view = memoryview(data)
+                for i in members:
+                    addr, size = blocks[i]
+                    results[i] = bytes(view[addr - start:addr - start + size])
+            else:
+                # Single block, or the span crossed something unreadable: read each on its own
+                for i in members:
+                    results[i] = self.read_memory(*blocks[i])
+        return results
+
+    def read_into(self, gc_address: int, buf: Union[bytearray, memoryview], size: Optional[int] = None) -> int:
+        """
+        Read memory into a caller-owned buffer instead of allocating a new bytes.
+
+        Args:
+            gc_address: GameCube virtual address (e.g., 0x80003000)
+            buf: writable buffer; the first size bytes are filled
+            size: Number of bytes to read (default len(buf))
+
+        Returns:
+            Number of bytes read, 0 if failed
+        """
         real_addr = self._gc_to_real_addr(gc_address)
         if real_addr is None:
-            return None
+            return 0
+
+        size = len(buf) if size is None else min(size, len(buf))
+        if hasattr(self.reader, "read_into"):
+            return self.reader.read_into(real_addr, buf, size)
 
-        return self.reader.read_memory(real_addr, size)
+        # Readers without read_into still return a fresh bytes; copy it in
+        data = self.reader.read_memory(real_addr, size)
+        if not data:
+            return 0
+        buf[:len(data)] = data
+        return len(data)
 
     def write_memory(self, gc_address: int, data: bytes) -> bool:
         """
@@ -107,14 +252,28 @@ class MemoryIPC:
         """Read a 32-bit word (4 bytes) as big-endian integer."""
         data = self.read_memory(gc_address, 4)
         if data and len(data) == 4:
-            return struct.unpack('>I', data)[0]
+            return _U32.unpack(data)[0]
         return None
 
     def read_float(self, gc_address: int) -> Optional[float]:
         """Read a 32-bit float as big-endian."""
         data = self.read_memory(gc_address, 4)
         if data and len(data) == 4:
-            return struct.unpack('>f', data)[0]
+            return _F32.unpack(data)[0]
+        return None
+
+    def read_words(self, gc_address: int, count: int) -> Optional[List[int]]:
+        """Read count consecutive big-endian 32-bit words with a single read."""
+        data = self.read_memory(gc_address, count * 4)
+        if data and len(data) == count * 4:
+            return list(struct.unpack(f'>{count}I', data))
+        return None
+
+    def read_floats(self, gc_address: int, count: int) -> Optional[List[float]]:
+        """Read count consecutive big-endian 32-bit floats with a single read."""
+        data = self.read_memory(gc_address, count * 4)
+        if data and len(data) == count * 4:
+            return list(struct.unpack(f'>{count}f', data))
         return None
 
     def read_byte(self, gc_address: int) -> Optional[int]:
@@ -126,12 +285,25 @@ class MemoryIPC:
 
     def read_string(self, gc_address: int, max_length: int = 256) -> Optional[str]:
         """Read a null-terminated string."""
-        data = self.read_memory(gc_address, max_length)
-        if data:
-            # Find null terminator
-            null_pos = data.find(b'\x00')
+        # Most strings are short: probe 16, then 64, 256... bytes and stop at the
+        # first NUL instead of always pulling max_length across the process boundary
+        data = None
+        chunk = 16
+        while data is None or len(data) < max_length:
+            pos = 0 if data is None else len(data)
+            part = self.read_memory(gc_address + pos, min(chunk, max_length - pos))
+            if not part:
+                break
+            if data is None:
+                data = bytearray()
+            data += part
+            # Find null terminator, only in the bytes just read
+            null_pos = data.find(b'\x00', pos)
             if null_pos >= 0:
-                data = data[:null_pos]
+                del data[null_pos:]
+                break
+            chunk *= 4
+        if data is not None:
             try:
                 # Animal Crossing uses a custom encoding, but ascii is fine for simple text
                 return data.decode('ascii', errors='ignore')
@@ -139,30 +311,51 @@ class MemoryIPC:
                 return None
         return None
 
-    def monitor_changes(self, gc_address: int, size: int, interval: float = 0.1) -> None:
+    def monitor_changes(self, gc_address: int, size: int, interval: float = 0.1, max_interval: float = 1.0) -> None:
         """
         Monitor a memory block for changes.
 
         Args:
             gc_address: GameCube address to monitor
             size: Size of block to monitor
-            interval: Check interval in seconds
+            interval: Check interval in seconds right after a change
+            max_interval: Longest interval the poll backs off to while the block is idle
         """
         print(f"🎮 Monitoring 0x{gc_address:08X} ({size} bytes)")
         print("Press Ctrl+C to stop")
 
-        last_data = None
+        # Two buffers reused for the whole run: no allocation per poll
+        current_data = bytearray(size)
+        last_data = bytearray(size)
+        have_last = False
+        delay = interval
+        # Bound once: the loop below runs for the life of the monitor
+        read_into = self.read_into
+        sleep = time.sleep
 
         try:
             while True:
-                current_data = self.read_memory(gc_address, size)
+                ok = read_into(gc_address, current_data) == size
 
-                if current_data != last_data and current_data is not None:
+                # A plain bytes compare is a memcmp, cheaper than hashing the block
+                if ok and (not have_last or current_data != last_data):
                     timestamp = time.strftime("%H:%M:%S")
-                    print(f"[{timestamp}] 0x{gc_address:08X}: {current_data.hex()}")
-                    last_data = current_data
-
-                time.sleep(interval)
+                    if not have_last or size <= MONITOR_PAGE_SIZE:
+                        print(f"[{timestamp}] 0x{gc_address:08X}: {current_data.hex()}")
+                    else:
+                        # Only print the pages that changed; slicing bytearrays beats memoryview compares
+                        for off in range(0, size, MONITOR_PAGE_SIZE):
+                            page = current_data[off:off + MONITOR_PAGE_SIZE]
+                            if page != last_data[off:off + MONITOR_PAGE_SIZE]:
+                                print(f"[{timestamp}] 0x{gc_address + off:08X}: {page.hex()}")
+                    last_data[:] = current_data
+                    have_last = True
+                    delay = interval
+                else:
+                    # Idle: wake up less often, but never slower than max_interval
+                    delay = min(delay * 1.5, max(interval, max_interval))
+
+                sleep(delay)
 
         except KeyboardInterrupt:
             print("\n⏹️ Monitoring stopped")
@@ -174,47 +367,63 @@ class MemoryIPC:
         Args:
             gc_address: GameCube address
             size: Number of bytes
-            format: "hex", "ascii", "words", "floats"
+            format: "hex", "ascii", "words", "floats", or "binary" (alias "raw")
+                to write the bytes unformatted to stdout (no header), e.g. for
+                piping into a file or xxd
         """
+        binary = format in ("binary", "raw")
         data = self.read_memory(gc_address, size)
         if not data:
-            print(f"❌ Could not read from 0x{gc_address:08X}")
+            # Keep stdout clean for binary output that is being piped somewhere
+            print(f"❌ Could not read from 0x{gc_address:08X}", file=sys.stderr if binary else sys.stdout)
+            return
+
+        if binary:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
             return
 
         print(f"📖 Memory dump: 0x{gc_address:08X} ({len(data)} bytes)")
 
+        # Rows are collected and written once instead of one print per row
+        lines: List[str] = []
+        append = lines.append
+
         if format == "hex":
             # Hex dump with ASCII
+            real_base = self._gc_to_real_addr(gc_address)
             for i in range(0, len(data), 16):
                 chunk = data[i:i + 16]
-                hex_str = ' '.join(f'{b:02X}' for b in chunk)
-                ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-                print(f"  {self._gc_to_real_addr(gc_address) + i:08X}: {hex_str:<48} {ascii_str}")
+                hex_str = chunk.hex(' ').upper()
+                ascii_str = chunk.translate(_PRINT_TBL).decode('ascii')
+                append(f"  {real_base + i:08X}: {hex_str:<48} {ascii_str}\n")
 
         elif format == "ascii":
             # ASCII dump
-            ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in data)
-            print(f"  ASCII: {ascii_str}")
+            ascii_str = data.translate(_PRINT_TBL).decode('ascii')
+            append(f"  ASCII: {ascii_str}\n")
 
         elif format == "words":
-            # 32-bit words
-            for i in range(0, len(data), 4):
-                if i + 4 <= len(data):
-                    word = struct.unpack('>I', data[i:i + 4])[0]
-                    print(f"  {gc_address + i:08X}: 0x{word:08X} ({word})")
+            # 32-bit words, decoded in one pass over the whole words
+            whole = len(data) - len(data) % 4
+            for i, (word,) in zip(range(0, whole, 4), _U32.iter_unpack(data[:whole])):
+                append(f"  {gc_address + i:08X}: 0x{word:08X} ({word})\n")
 
         elif format == "floats":
             # 32-bit floats
-            for i in range(0, len(data), 4):
-                if i + 4 <= len(data):
-                    float_val = struct.unpack('>f', data[i:i + 4])[0]
-                    print(f"  {gc_address + i:08X}: {float_val:.6f}")
+            whole = len(data) - len(data) % 4
+            for i, (float_val,) in zip(range(0, whole, 4), _F32.iter_unpack(data[:whole])):
+                append(f"  {gc_address + i:08X}: {float_val:.6f}\n")
+
+        sys.stdout.write("".join(lines))
 
     def disconnect(self):
         """Disconnect from Dolphin."""
         if self.reader:
             self.reader.disconnect()
         self.connected = False
+        self._gc_offset = None
 
 
 # Convenience functions for quick access
@@ -236,6 +445,22 @@ def read_memory(gc_address: int, size: int) -> Optional[bytes]:
     return _ipc.read_memory(gc_address, size)
 
 
+def read_many(blocks: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+    """Read several (address, size) blocks."""
+    if not _ipc or not _ipc.connected:
+        print("❌ Not connected. Call connect() first.")
+        return [None] * len(blocks)
+    return _ipc.read_many(blocks)
+
+
+def read_into(gc_address: int, buf: Union[bytearray, memoryview], size: Optional[int] = None) -> int:
+    """Read memory into buf; returns bytes read."""
+    if not _ipc or not _ipc.connected:
+        print("❌ Not connected. Call connect() first.")
+        return 0
+    return _ipc.read_into(gc_address, buf, size)
+
+
 def read_word(gc_address: int) -> Optional[int]:
     """Read 32-bit word."""
     if not _ipc or not _ipc.connected:
@@ -252,6 +477,22 @@ def read_float(gc_address: int) -> Optional[float]:
     return _ipc.read_float(gc_address)
 
 
+def read_words(gc_address: int, count: int) -> Optional[List[int]]:
+    """Read count 32-bit words."""
+    if not _ipc or not _ipc.connected:
+        print("❌ Not connected. Call connect() first.")
+        return None
+    return _ipc.read_words(gc_address, count)
+
+
+def read_floats(gc_address: int, count: int) -> Optional[List[float]]:
+    """Read count 32-bit floats."""
+    if not _ipc or not _ipc.connected:
+        print("❌ Not connected. Call connect() first.")
+        return None
+    return _ipc.read_floats(gc_address, count)
+
+
 def read_byte(gc_address: int) -> Optional[int]:
     """Read single byte."""
     if not _ipc or not _ipc.connected:
@@ -284,8 +525,22 @@ def dump(gc_address: int, size: int = 64, format: str = "hex"):
     _ipc.dump_memory(gc_address, size, format)
 
 
-def main():
-    """Example usage."""
+def main(argv: Optional[List[str]] = None):
+    """Example usage, or a one-shot dump with --dump ADDRESS SIZE."""
+    parser = argparse.ArgumentParser(description="Read GameCube memory from a running Dolphin.")
+    parser.add_argument("--dump", nargs=2, metavar=("ADDRESS", "SIZE"), type=lambda x: int(x, 0), help="Dump SIZE bytes at ADDRESS (hex or int) and exit")
+    parser.add_argument("--format", choices=["hex", "ascii", "words", "floats", "binary"], default="hex", help="Dump format; binary writes the raw bytes to stdout for piping into a file or xxd (default: hex)")
+    args = parser.parse_args(argv)
+
+    if args.dump:
+        # Status messages go to stderr so a binary dump on stdout stays byte-exact
+        with contextlib.redirect_stdout(sys.stderr):
+            connected = connect()
+        if not connected:
+            sys.exit(1)
+        dump(args.dump[0], args.dump[1], args.format)
+        return
+
     print("🎮 Memory IPC Example Usage")
     print()
 
@@ -314,6 +569,7 @@ def main():
     print("  read_word(0x80003000)        # Read 32-bit word")
     print("  read_float(0x80100000)       # Read float")
     print("  dump(0x80000000, 64)         # Hex dump")
+    print("  python memory_ipc.py --dump 0x80000000 0x1800000 --format binary > mem1.bin")
     print("  monitor(0x80003000, 4)       # Monitor for changes")
 
 
@@ -0,0 +1,63 @@
+"""
+Small SQLite-backed cache for LLM responses, keyed by a hash of the request.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from gossip import DEFAULT_STATE_PATH
+
+
+# Kept beside the gossip state so all local runtime data lives in one place
+DEFAULT_CACHE_PATH = os.environ.get("DIALOGUE_CACHE_PATH", os.path.join(os.path.dirname(DEFAULT_STATE_PATH), "dialogue_cache.db"))
+DEFAULT_TTL = float(os.environ.get("DIALOGUE_CACHE_TTL", str(24 * 60 * 60)))
+
+
+def make_key(*parts: Optional[str]) -> str:
+    """Returns a SHA256 hex digest over parts; None and "" hash differently."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(b"\x00" if part is None else b"\x01" + part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, val TEXT NOT NULL, ts REAL NOT NULL)")
+    return conn
+
+
+def get(key: str, ttl: float = DEFAULT_TTL, path: str = DEFAULT_CACHE_PATH) -> Optional[str]:
+    """Returns the cached value for key if it is younger than ttl seconds."""
+    try:
+        conn = _open(path)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute("SELECT val, ts FROM responses WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    if row is None or time.time() - row[1] > ttl:
+        return None
+    return row[0]
+
+
+def put(key: str, val: str, path: str = DEFAULT_CACHE_PATH) -> None:
+    """Stores val under key; failures are ignored, the cache is best-effort."""
+    try:
+        conn = _open(path)
+    except sqlite3.Error:
+        return
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, val, ts) VALUES (?, ?, ?)", (key, val, time.time()))
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
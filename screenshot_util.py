@@ -1,14 +1,62 @@
 import os
+import threading
 import time
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
 
+# Last window the bbox came from; re-reading one window's geometry is much
+# cheaper than enumerating every top-level window again
+_bbox_cache = {"win": None}
+
+# DOLPHIN_SHOT_FMT -> (extension, PIL format, save options). PNG's zlib pass is
+# slow and large; the vision models downscale anyway, so JPEG is the default.
+_SHOT_FORMATS = {
+    "jpeg": (".jpg", "JPEG", {"quality": 85}),
+    "jpg": (".jpg", "JPEG", {"quality": 85}),
+    "webp": (".webp", "WEBP", {"quality": 80, "method": 4}),
+    "png": (".png", "PNG", {}),
+}
+
+# One mss capture context per thread (its handles are not shareable across threads)
+_sct_local = threading.local()
+
+# Single background worker for capture_dolphin_screenshot_async, started on first use
+_shot_pool: Optional[ThreadPoolExecutor] = None
+_shot_pool_lock = threading.Lock()
+
+
+def _window_bbox(w) -> Optional[tuple]:
+    """Returns (left, top, width, height) for a usable window, else None."""
+    if getattr(w, "isMinimized", False):
+        return None
+    try:
+        left, top, right, bottom = w.left, w.top, w.right, w.bottom
+    except Exception:
+        return None
+    width = max(0, right - left)
+    height = max(0, bottom - top)
+    if width > 200 and height > 200:
+        return (left, top, width, height)
+    return None
+
+
 def _find_dolphin_window_bbox() -> Optional[tuple]:
     """Try to find the Dolphin window bounding box (left, top, width, height).
 
     Attempts via pygetwindow; falls back to None if unavailable.
     """
+    cached = _bbox_cache["win"]
+    if cached is not None:
+        try:
+            bbox = _window_bbox(cached)
+        except Exception:
+            bbox = None
+        if bbox is not None:
+            return bbox
+        _bbox_cache["win"] = None
+
     try:
         import pygetwindow as gw  # type: ignore
     except Exception:
@@ -22,25 +70,48 @@ def _find_dolphin_window_bbox() -> Optional[tuple]:
                 continue
             t = title.lower()
             if "dolphin" in t or "animal crossing" in t or "gafe01" in t:
-                if getattr(w, "isMinimized", False):
-                    continue
-                try:
-                    left, top, right, bottom = w.left, w.top, w.right, w.bottom
-                    width = max(0, right - left)
-                    height = max(0, bottom - top)
-                    if width > 200 and height > 200:
-                        candidates.append((left, top, width, height))
-                except Exception:
-                    continue
+                bbox = _window_bbox(w)
+                if bbox is not None:
+                    candidates.append((bbox, w))
         if candidates:
             # Prefer the largest area
-            candidates.sort(key=lambda r: r[2] * r[3], reverse=True)
-            return candidates[0]
+            candidates.sort(key=lambda c: c[0][2] * c[0][3], reverse=True)
+            bbox, _bbox_cache["win"] = candidates[0]
+            return bbox
     except Exception:
         return None
     return None
 
 
+def _grab_with_mss(region: Optional[tuple], out_path: str, fmt: str, save_opts: dict) -> bool:
+    """Capture region (or the primary monitor) via mss and save it as fmt.
+
+    Returns False if mss is unavailable so the caller can fall back to pyautogui.
+    """
+    try:
+        import mss  # type: ignore
+        import mss.tools  # type: ignore
+    except Exception:
+        return False
+
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        sct = mss.mss()
+        _sct_local.sct = sct
+    if region is not None:
+        left, top, width, height = region
+        area = {"left": left, "top": top, "width": width, "height": height}
+    else:
+        area = sct.monitors[1]
+    shot = sct.grab(area)
+    if fmt == "PNG":
+        mss.tools.to_png(shot.rgb, shot.size, output=out_path)
+    else:
+        from PIL import Image  # type: ignore
+        Image.frombytes("RGB", shot.size, shot.rgb).save(out_path, fmt, **save_opts)
+    return True
+
+
 def capture_dolphin_screenshot(out_dir: Optional[str] = None) -> Optional[str]:
     """Capture a screenshot of the Dolphin game window if possible.
 
@@ -48,26 +119,47 @@ def capture_dolphin_screenshot(out_dir: Optional[str] = None) -> Optional[str]:
     - Falls back to a full-screen screenshot if the window cannot be found.
     - Returns the saved image path on success, or None on failure.
     """
-    try:
-        import pyautogui  # type: ignore
-    except Exception:
-        return None
-
     # Prepare output path
     base_dir = out_dir or os.path.join(tempfile.gettempdir(), "dolphin_listener_shots")
     os.makedirs(base_dir, exist_ok=True)
     ts = time.strftime("%Y%m%d-%H%M%S")
-    out_path = os.path.join(base_dir, f"dolphin-shot-{ts}.png")
+    ext, fmt, save_opts = _SHOT_FORMATS.get(os.environ.get("DOLPHIN_SHOT_FMT", "jpeg").lower(), _SHOT_FORMATS["jpeg"])
+    out_path = os.path.join(base_dir, f"dolphin-shot-{ts}{ext}")
 
     region = _find_dolphin_window_bbox()
+    try:
+        # mss copies just the region; pyautogui grabs the whole screen and crops
+        if _grab_with_mss(region, out_path, fmt, save_opts):
+            return out_path
+    except Exception:
+        pass
+
+    try:
+        import pyautogui  # type: ignore
+    except Exception:
+        return None
+
     try:
         if region is not None:
             img = pyautogui.screenshot(region=region)  # type: ignore[arg-type]
         else:
             img = pyautogui.screenshot()
-        img.save(out_path)
+        if fmt != "PNG" and img.mode != "RGB":
+            img = img.convert("RGB")
+        img.save(out_path, fmt, **save_opts)
         return out_path
     except Exception:
         return None
 
 
+def capture_dolphin_screenshot_async(out_dir: Optional[str] = None) -> "Future[Optional[str]]":
+    """Start capture_dolphin_screenshot on a background worker and return at once.
+
+    The caller can do other work while the window is grabbed and encoded, then
+    call .result() on the returned future for the saved path (or None).
+    """
+    global _shot_pool
+    with _shot_pool_lock:
+        if _shot_pool is None:
+            _shot_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dolphin-shot")
+    return _shot_pool.submit(capture_dolphin_screenshot, out_dir)
@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from character_scraper import FandomVillagerScraper, _ORDINAL_RE
+
+
+LIST_HTML = """
+<div class="mw-parser-output"><table>
+<tr>
+  <td><a href="/wiki/Ace">Ace</a></td>
+  <td><img src="ace.png"></td>
+  <td><a href="/wiki/Jock">Jock</a> ♂</td>
+  <td><a href="/wiki/Bird">Bird</a></td>
+  <td>March 13<sup>th</sup></td>
+  <td><i>"ace"</i></td>
+</tr>
+<tr>
+  <td><a href="/wiki/Tia">Tia</a></td>
+  <td><img src="tia.png"></td>
+  <td><a href="/wiki/Normal">Normal</a> ♀</td>
+  <td><a href="/wiki/Elephant">Elephant</a></td>
+  <td>August 22nd</td>
+  <td><i>"teacup"</i></td>
+</tr>
+</table></div>
+"""
+
+
+def test_ordinal_suffix_with_space_is_stripped():
+    # The list page renders the suffix in <sup>, so the cell text is "13 th"
+    assert _ORDINAL_RE.sub("", "March 13 th").strip() == "March 13"
+    assert _ORDINAL_RE.sub("", "January 27 th").strip() == "January 27"
+
+
+def test_ordinal_suffix_attached_is_stripped_and_month_kept():
+    assert _ORDINAL_RE.sub("", "August 2nd").strip() == "August 2"
+    assert _ORDINAL_RE.sub("", "August 21st").strip() == "August 21"
+
+
+def test_fetch_villager_list_birthdays(monkeypatch):
+    scraper = FandomVillagerScraper(cache_dir=None)
+    monkeypatch.setattr(scraper, "_get", lambda url: LIST_HTML)
+    rows = scraper.fetch_villager_list()
+    assert [(r.name, r.birthday) for r in rows] == [("Ace", "March 13"), ("Tia", "August 22")]
+
+
+class _Response:
+    status_code = 200
+    text = "<html></html>"
+    headers = {}
+
+
+def test_request_rate_is_shared_across_workers(monkeypatch):
+    scraper = FandomVillagerScraper(delay_seconds=0.05, cache_dir=None, workers=4)
+    sent = []
+
+    def fake_get(url, timeout=None, headers=None):
+        sent.append(time.monotonic())
+        return _Response()
+
+    monkeypatch.setattr(scraper.session, "get", fake_get)
+    with ThreadPoolExecutor(max_workers=scraper.workers) as pool:
+        list(pool.map(scraper._get, [f"https://example.invalid/{i}" for i in range(6)]))
+    sent.sort()
+    gaps = [b - a for a, b in zip(sent, sent[1:])]
+    assert min(gaps) >= 0.045
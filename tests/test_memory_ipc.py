@@ -0,0 +1,105 @@
+import struct
+
+import memory_ipc
+from memory_ipc import GC_MEM1_START, MemoryIPC
+
+BASE = 0x10000000
+
+
+class FakeReader:
+    """Serves reads from a byte pattern; addresses in `holes` are unreadable."""
+
+    def __init__(self, holes=()):
+        self.calls = []
+        self.holes = set(holes)
+
+    def read_memory(self, addr, size):
+        self.calls.append((addr - BASE + GC_MEM1_START, size))
+        if any(addr <= BASE + (h - GC_MEM1_START) < addr + size for h in self.holes):
+            return None
+        return bytes((addr + i) & 0xFF for i in range(size))
+
+
+def make_ipc(reader):
+    ipc = MemoryIPC.__new__(MemoryIPC)
+    ipc.reader = reader
+    ipc.connected = True
+    ipc.gamecube_base = BASE
+    ipc._gc_offset = BASE - GC_MEM1_START
+    return ipc
+
+
+def expected(gc_address, size):
+    real = gc_address - GC_MEM1_START + BASE
+    return bytes((real + i) & 0xFF for i in range(size))
+
+
+def test_nearby_blocks_are_coalesced_into_one_read():
+    reader = FakeReader()
+    ipc = make_ipc(reader)
+    blocks = [(0x80001100, 8), (0x80001000, 16), (0x80001200, 4)]
+    results = ipc.read_many(blocks)
+    assert reader.calls == [(0x80001000, 0x204)]
+    assert results == [expected(a, s) for a, s in blocks]
+
+
+def test_distant_blocks_are_read_separately():
+    reader = FakeReader()
+    ipc = make_ipc(reader)
+    far = 0x80001000 + memory_ipc.READ_MANY_GAP + 0x100
+    blocks = [(0x80001000, 16), (far, 16)]
+    results = ipc.read_many(blocks)
+    assert reader.calls == [(0x80001000, 16), (far, 16)]
+    assert results == [expected(a, s) for a, s in blocks]
+
+
+def test_failed_span_falls_back_to_single_reads():
+    reader = FakeReader(holes={0x80001080})
+    ipc = make_ipc(reader)
+    blocks = [(0x80001000, 16), (0x80001100, 16)]
+    results = ipc.read_many(blocks)
+    assert reader.calls == [(0x80001000, 0x110), (0x80001000, 16), (0x80001100, 16)]
+    assert results == [expected(a, s) for a, s in blocks]
+
+
+def test_empty_and_unmapped_blocks_yield_none():
+    ipc = make_ipc(FakeReader())
+    assert ipc.read_many([(0x80001000, 0), (0x70000000, 4)]) == [None, None]
+
+
+def test_read_words_and_floats_use_one_read():
+    reader = FakeReader()
+    ipc = make_ipc(reader)
+    raw = expected(0x80002000, 8)
+    assert ipc.read_words(0x80002000, 2) == list(struct.unpack(">2I", raw))
+    assert ipc.read_floats(0x80002000, 2) == list(struct.unpack(">2f", raw))
+    assert reader.calls == [(0x80002000, 8), (0x80002000, 8)]
+
+
+def test_read_words_returns_none_on_failed_read():
+    ipc = make_ipc(FakeReader(holes={0x80002004}))
+    assert ipc.read_words(0x80002000, 2) is None
+
+
+class IntoReader(FakeReader):
+    """Like the macOS reader: read_memory exits on a failed read, read_into returns 0."""
+
+    def read_into(self, addr, buf, size):
+        data = FakeReader.read_memory(self, addr, size)
+        if data is None:
+            return 0
+        buf[:size] = data
+        return size
+
+    def read_memory(self, addr, size):
+        data = FakeReader.read_memory(self, addr, size)
+        if data is None:
+            raise SystemExit(1)
+        return data
+
+
+def test_failed_span_is_read_without_exiting():
+    reader = IntoReader(holes={0x80001080})
+    ipc = make_ipc(reader)
+    blocks = [(0x80001000, 16), (0x80001100, 16)]
+    assert ipc.read_many(blocks) == [expected(a, s) for a, s in blocks]
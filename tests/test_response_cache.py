@@ -0,0 +1,36 @@
+import response_cache
+
+
+def test_put_then_get(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = response_cache.make_key("prompt", "model")
+    response_cache.put(key, "hello", path=path)
+    assert response_cache.get(key, path=path) == "hello"
+
+
+def test_missing_key(tmp_path):
+    path = str(tmp_path / "cache.db")
+    assert response_cache.get(response_cache.make_key("nothing"), path=path) is None
+
+
+def test_put_replaces_value(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = response_cache.make_key("prompt")
+    response_cache.put(key, "old", path=path)
+    response_cache.put(key, "new", path=path)
+    assert response_cache.get(key, path=path) == "new"
+
+
+def test_expired_entry(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    key = response_cache.make_key("prompt")
+    monkeypatch.setattr(response_cache.time, "time", lambda: 1000.0)
+    response_cache.put(key, "stale", path=path)
+    monkeypatch.setattr(response_cache.time, "time", lambda: 1061.0)
+    assert response_cache.get(key, ttl=60, path=path) is None
+    assert response_cache.get(key, ttl=120, path=path) == "stale"
+
+
+def test_make_key_distinguishes_none_and_empty():
+    assert response_cache.make_key(None) != response_cache.make_key("")
+    assert response_cache.make_key("ab", "c") != response_cache.make_key("a", "bc")
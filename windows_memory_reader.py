@@ -7,8 +7,13 @@ Custom implementation to read memory from the Dolphin process on Windows using t
 import ctypes
 from ctypes import wintypes
 import struct
-from typing import Optional, List, Tuple
-import psutil
+import sys
+import threading
+from typing import Dict, Optional, List, Tuple, Union
+
+# Big-endian GameCube scalars, format strings parsed once
+_U32 = struct.Struct('>I')
+_F32 = struct.Struct('>f')
 
 
 # --- Define necessary Windows structures and constants ---
@@ -26,6 +31,38 @@ class MEMORY_BASIC_INFORMATION(ctypes.Structure):
     ]
 
 
+class UNICODE_STRING(ctypes.Structure):
+    _fields_ = [
+        ('Length', ctypes.c_uint16),
+        ('MaximumLength', ctypes.c_uint16),
+        ('Buffer', ctypes.c_void_p),
+    ]
+
+
+# Prefix of SYSTEM_PROCESS_INFORMATION up to UniqueProcessId. The layout differs
+# between 32- and 64-bit Windows; pointer-sized members are c_void_p so ctypes
+# places them natively (ImageName at 0x38 on both, UniqueProcessId at 0x44 on
+# 32-bit and 0x50 on 64-bit).
+class SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ('NextEntryOffset', ctypes.c_uint32),
+        ('NumberOfThreads', ctypes.c_uint32),
+        ('WorkingSetPrivateSize', ctypes.c_int64),
+        ('HardFaultCount', ctypes.c_uint32),
+        ('NumberOfThreadsHighWatermark', ctypes.c_uint32),
+        ('CycleTime', ctypes.c_uint64),
+        ('CreateTime', ctypes.c_int64),
+        ('UserTime', ctypes.c_int64),
+        ('KernelTime', ctypes.c_int64),
+        ('ImageName', UNICODE_STRING),
+        ('BasePriority', ctypes.c_int32),
+        ('UniqueProcessId', ctypes.c_void_p),
+    ]
+
+
+SYSTEM_PROCESS_INFORMATION_CLASS = 5
+STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+
 # Process access rights constants
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_READ = 0x0010
@@ -44,6 +81,38 @@ PAGE_EXECUTE_READWRITE = 0x40
 PAGE_EXECUTE_READ = 0x20
 
 
+def _protection_to_string(protection_flags: int) -> str:
+    prot = ['-', '-', '-']
+    if protection_flags & (PAGE_READONLY | PAGE_READWRITE | PAGE_EXECUTE_READ | PAGE_EXECUTE_READWRITE):
+        prot[0] = 'r'
+    if protection_flags & (PAGE_READWRITE | PAGE_EXECUTE_READWRITE):
+        prot[1] = 'w'
+    if protection_flags & (PAGE_EXECUTE_READ | PAGE_EXECUTE_READWRITE):
+        prot[2] = 'x'
+    return "".join(prot)
+
+
+# 'rwx' string for every value of the low protection byte (the modifier bits such
+# as PAGE_GUARD sit above it), interned so region tuples share the same objects
+_PROT_STRINGS = tuple(sys.intern(_protection_to_string(flags)) for flags in range(256))
+
+# get_memory_regions results per process handle; the VirtualQueryEx walk is the
+# expensive part of a scan. A handle's entry is dropped when it is opened (the
+# value may belong to an earlier, closed handle), on disconnect and whenever a
+# read through it fails, since the layout may have changed.
+_REGION_CACHE: Dict[int, List[Tuple[int, int, str]]] = {}
+
+
+def clear_region_cache(handle: int) -> None:
+    """Forget the cached regions for one process handle."""
+    _REGION_CACHE.pop(handle, None)
+
+
+# read_memory reuses a per-thread buffer up to this size; larger reads (such as
+# a whole 24MB MEM1 dump) get a one-off buffer so no thread keeps it alive
+MAX_RETAINED_READ_BUFFER = 1024 * 1024
+
+
 class WindowsMemoryReader:
     """Direct memory reader for Windows processes using the Win32 API."""
 
@@ -51,6 +120,8 @@ class WindowsMemoryReader:
         self.pid = None
         self.process_handle = None
         self.is_connected = False
+        # Per-thread reusable read buffer (bytearray plus a ctypes view of it)
+        self._local = threading.local()
 
         # Load kernel32.dll
         self.kernel32 = ctypes.windll.kernel32
@@ -84,9 +155,31 @@ class WindowsMemoryReader:
         self.kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
         self.kernel32.CloseHandle.restype = wintypes.BOOL
 
+        # NtQuerySystemInformation
+        ntdll = ctypes.windll.ntdll
+        ntdll.NtQuerySystemInformation.argtypes = [wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG,
+                                                   ctypes.POINTER(wintypes.ULONG)]
+        ntdll.NtQuerySystemInformation.restype = ctypes.c_long
+        self._NtQuerySystemInformation = ntdll.NtQuerySystemInformation
+
+        # Bound once so each call skips the WinDLL attribute lookup
+        self._OpenProcess = self.kernel32.OpenProcess
+        self._ReadProcessMemory = self.kernel32.ReadProcessMemory
+        self._WriteProcessMemory = self.kernel32.WriteProcessMemory
+        self._VirtualQueryEx = self.kernel32.VirtualQueryEx
+        self._CloseHandle = self.kernel32.CloseHandle
+
     def find_dolphin_process(self) -> Optional[int]:
         """Find the running Dolphin process."""
         try:
+            return self._find_process_native('Dolphin')
+        except Exception:
+            pass  # fall back to psutil
+
+        try:
+            # Imported only here: psutil is heavy and the native scan normally succeeds
+            import psutil
+
             # Look for Dolphin.exe or a process named Dolphin
             for proc in psutil.process_iter(['pid', 'name']):
                 if 'Dolphin' in proc.info['name']:
@@ -96,6 +189,35 @@ class WindowsMemoryReader:
             print(f"Error finding Dolphin process: {e}")
             return None
 
+    def _find_process_native(self, name_part: str) -> Optional[int]:
+        """Scan one NtQuerySystemInformation snapshot for an image name containing name_part.
+
+        Avoids psutil opening every process just to read its name. Raises on API
+        failure so the caller can fall back.
+        """
+        size = wintypes.ULONG(0x40000)
+        while True:
+            buf = ctypes.create_string_buffer(size.value)
+            status = self._NtQuerySystemInformation(
+                SYSTEM_PROCESS_INFORMATION_CLASS, buf, size.value, ctypes.byref(size)
+            ) & 0xFFFFFFFF
+            if status != STATUS_INFO_LENGTH_MISMATCH:
+                break
+            size.value += 0x10000  # Headroom for processes started in between
+        if status != 0:
+            raise OSError(f"NtQuerySystemInformation failed (NTSTATUS 0x{status:08X})")
+
+        base = ctypes.addressof(buf)
+        offset = 0
+        while True:
+            info = SYSTEM_PROCESS_INFORMATION.from_address(base + offset)
+            image = info.ImageName
+            if image.Buffer and name_part in ctypes.wstring_at(image.Buffer, image.Length // 2):
+                return info.UniqueProcessId
+            if not info.NextEntryOffset:
+                return None
+            offset += info.NextEntryOffset
+
     def connect_to_process(self, pid: int = None) -> bool:
         """Connect to the Dolphin process."""
         if pid is None:
@@ -111,7 +233,7 @@ class WindowsMemoryReader:
         access_rights = (PROCESS_QUERY_INFORMATION | PROCESS_VM_READ | PROCESS_VM_WRITE | PROCESS_VM_OPERATION)
 
         # Get a handle to the process
-        handle = self.kernel32.OpenProcess(access_rights, False, self.pid)
+        handle = self._OpenProcess(access_rights, False, self.pid)
 
         if not handle:
             error_code = self.kernel32.GetLastError()
@@ -119,6 +241,7 @@ class WindowsMemoryReader:
             print("   This usually means you need to run the script as an Administrator.")
             return False
 
+        clear_region_cache(handle)
         self.process_handle = handle
         self.is_connected = True
         print(f"✅ Successfully connected to Dolphin process!")
@@ -130,13 +253,13 @@ class WindowsMemoryReader:
             print("❌ Not connected to process")
             return None
 
-        buffer = ctypes.create_string_buffer(size)
+        buf, target = self._read_buffer(size)
         bytes_read = ctypes.c_size_t(0)
 
-        result = self.kernel32.ReadProcessMemory(
+        result = self._ReadProcessMemory(
             self.process_handle,
             address,
-            buffer,
+            target,
             size,
             ctypes.byref(bytes_read)
         )
@@ -145,9 +268,51 @@ class WindowsMemoryReader:
             # Uncomment for deep debugging:
             # error_code = self.kernel32.GetLastError()
             # print(f"❌ Failed to read memory at 0x{address:016X} (Error code: {error_code})")
+            self.invalidate_cache()
             return None
 
-        return buffer.raw[:bytes_read.value]
+        # One copy of just the bytes read, instead of .raw plus a slice
+        return bytes(memoryview(buf)[:bytes_read.value])
+
+    def _read_buffer(self, size: int) -> Tuple[bytearray, ctypes.Array]:
+        """Return a scratch buffer holding at least size bytes.
+
+        Up to MAX_RETAINED_READ_BUFFER this is the thread's reusable buffer,
+        grown as needed; larger reads get a temporary buffer.
+        """
+        if size > MAX_RETAINED_READ_BUFFER:
+            buf = bytearray(size)
+            return buf, (ctypes.c_char * size).from_buffer(buf)
+        buf = getattr(self._local, "buf", None)
+        if buf is None or len(buf) < size:
+            buf = bytearray(min(MAX_RETAINED_READ_BUFFER, max(size, 65536, 2 * len(buf) if buf else 0)))
+            self._local.buf = buf
+            self._local.target = (ctypes.c_char * len(buf)).from_buffer(buf)
+        return buf, self._local.target
+
+    def read_into(self, address: int, buf: Union[bytearray, memoryview], size: Optional[int] = None) -> int:
+        """Read size bytes (default len(buf)) into the start of buf; returns bytes read, 0 on failure."""
+        if not self.is_connected:
+            print("❌ Not connected to process")
+            return 0
+
+        size = len(buf) if size is None else min(size, len(buf))
+        target = (ctypes.c_char * len(buf)).from_buffer(buf)
+        bytes_read = ctypes.c_size_t(0)
+
+        result = self._ReadProcessMemory(
+            self.process_handle,
+            address,
+            target,
+            size,
+            ctypes.byref(bytes_read)
+        )
+
+        if not result:
+            self.invalidate_cache()
+            return 0
+
+        return bytes_read.value
 
     def write_memory(self, address: int, data: bytes) -> bool:
         """Write memory to the connected process."""
@@ -156,10 +321,14 @@ class WindowsMemoryReader:
             return False
 
         size = len(data)
-        buffer = ctypes.create_string_buffer(data)
+        if isinstance(data, bytes):
+            # LPCVOID accepts bytes as-is: a pointer to its own storage, no copy
+            buffer = data
+        else:
+            buffer = (ctypes.c_char * size).from_buffer_copy(data)
         bytes_written = ctypes.c_size_t(0)
 
-        result = self.kernel32.WriteProcessMemory(
+        result = self._WriteProcessMemory(
             self.process_handle,
             address,
             buffer,
@@ -174,32 +343,44 @@ class WindowsMemoryReader:
 
         return True
 
-    def get_memory_regions(self) -> List[Tuple[int, int, str]]:
-        """Get list of memory regions in the target process."""
+    def get_memory_regions(self, *, min_size: int = 0, writable_only: bool = False) -> List[Tuple[int, int, str]]:
+        """Get list of memory regions in the target process (cached per handle).
+
+        The full walk is cached; min_size / writable_only filter the cached list,
+        so repeated scans (filtered or not) skip VirtualQueryEx entirely.
+        """
         if not self.is_connected:
             return []
 
+        regions = _REGION_CACHE.get(self.process_handle)
+        if regions is None:
+            regions = self._walk_memory_regions()
+            _REGION_CACHE[self.process_handle] = regions
+        if min_size or writable_only:
+            return [r for r in regions if r[1] >= min_size and (not writable_only or r[2][1] == 'w')]
+        return list(regions)
+
+    def _walk_memory_regions(self) -> List[Tuple[int, int, str]]:
+        """List every committed region with VirtualQueryEx."""
         regions = []
+        append = regions.append
         current_address = 0
+        # One struct, pointer and size reused for every VirtualQueryEx call
+        mbi = MEMORY_BASIC_INFORMATION()
+        mbi_ref = ctypes.byref(mbi)
+        mbi_size = ctypes.sizeof(mbi)
+        query = self._VirtualQueryEx
+        handle = self.process_handle
 
         while True:
-            mbi = MEMORY_BASIC_INFORMATION()
-            result = self.kernel32.VirtualQueryEx(
-                self.process_handle,
-                current_address,
-                ctypes.byref(mbi),
-                ctypes.sizeof(mbi)
-            )
+            result = query(handle, current_address, mbi_ref, mbi_size)
 
             if result == 0:
                 break  # Reached end of address space
 
             # We are interested in committed memory that is not free
             if mbi.State == MEM_COMMIT:
-                addr = mbi.BaseAddress
-                size = mbi.RegionSize
-                prot = self._get_protection_string(mbi.Protect)
-                regions.append((addr, size, prot))
+                append((mbi.BaseAddress, mbi.RegionSize, _PROT_STRINGS[mbi.Protect & 0xFF]))
 
             # --- THIS IS THE FIX ---
             # Handle case where BaseAddress can be None for address 0
@@ -209,43 +390,64 @@ class WindowsMemoryReader:
 
         return regions
 
+    def invalidate_cache(self) -> None:
+        """Drop the cached region list so the next get_memory_regions re-walks."""
+        if self.process_handle:
+            clear_region_cache(self.process_handle)
+
     def _get_protection_string(self, protection_flags: int) -> str:
         """Convert Windows memory protection flags to a 'rwx' string."""
-        prot = ['-', '-', '-']
-        if protection_flags & (PAGE_READONLY | PAGE_READWRITE | PAGE_EXECUTE_READ | PAGE_EXECUTE_READWRITE):
-            prot[0] = 'r'
-        if protection_flags & (PAGE_READWRITE | PAGE_EXECUTE_READWRITE):
-            prot[1] = 'w'
-        if protection_flags & (PAGE_EXECUTE_READ | PAGE_EXECUTE_READWRITE):
-            prot[2] = 'x'
-        return "".join(prot)
+        return _PROT_STRINGS[protection_flags & 0xFF]
 
     def disconnect(self):
         """Disconnect from the process by closing the handle."""
+        self.invalidate_cache()
         if self.process_handle:
-            self.kernel32.CloseHandle(self.process_handle)
+            self._CloseHandle(self.process_handle)
         self.is_connected = False
         self.process_handle = None
         self.pid = None
 
     # --- Helper methods (identical to macOS version, provided for completeness) ---
 
+    def _read_small(self, address: int, size: int) -> Optional[ctypes.Array]:
+        """Read up to 8 bytes into this thread's fixed scratch array; no allocation."""
+        if not self.is_connected:
+            print("❌ Not connected to process")
+            return None
+
+        scratch = getattr(self._local, "scratch8", None)
+        if scratch is None:
+            scratch = self._local.scratch8 = (ctypes.c_ubyte * 8)()
+        bytes_read = ctypes.c_size_t(0)
+        result = self._ReadProcessMemory(
+            self.process_handle,
+            address,
+            scratch,
+            size,
+            ctypes.byref(bytes_read)
+        )
+        if not result or bytes_read.value != size:
+            self.invalidate_cache()
+            return None
+        return scratch
+
     def read_byte(self, address: int) -> Optional[int]:
-        data = self.read_memory(address, 1)
-        if data:
-            return data[0]
+        scratch = self._read_small(address, 1)
+        if scratch is not None:
+            return scratch[0]
         return None
 
     def read_word(self, address: int) -> Optional[int]:
-        data = self.read_memory(address, 4)
-        if data and len(data) == 4:
-            return struct.unpack('>I', data)[0]
+        scratch = self._read_small(address, 4)
+        if scratch is not None:
+            return _U32.unpack_from(scratch)[0]
         return None
 
     def read_float(self, address: int) -> Optional[float]:
-        data = self.read_memory(address, 4)
-        if data and len(data) == 4:
-            return struct.unpack('>f', data)[0]
+        scratch = self._read_small(address, 4)
+        if scratch is not None:
+            return _F32.unpack_from(scratch)[0]
         return None
 
 
@@ -263,13 +465,8 @@ def main():
         return
 
     print("\n📋 Memory regions (looking for large RW regions that could be GameCube memory):")
-    regions = reader.get_memory_regions()
-
-    # Look for interesting regions (large, readable/writable)
-    interesting_regions = []
-    for addr, size, prot in regions:
-        if size >= 0x1800000 and 'rw' in prot:  # At least 24MB and readable/writable
-            interesting_regions.append((addr, size, prot))
+    # Look for interesting regions (at least 24MB and readable/writable)
+    interesting_regions = reader.get_memory_regions(min_size=0x1800000, writable_only=True)
 
     print(f"Found {len(interesting_regions)} potential GameCube memory regions:")
     for addr, size, prot in interesting_regions: